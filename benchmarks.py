@@ -0,0 +1,338 @@
+"""
+BENCHMARKS.PY - Offline Pipeline Benchmarks
+============================================
+Measures the scraping and email pipeline without LinkedIn or Gmail, using the
+stand-ins from local_servers.py:
+
+- extraction: synthetic content-search pages fetched from LocalSearchPageServer,
+  run through the blacklist filter and email extraction (post texts, and the
+  page_source fallback)
+- dedupe: save_emails_to_file() against a ledger built from a synthetic
+  emails_output.csv history (10k-1M rows), including the one-time CSV import
+  and index load
+- send: send_bulk_emails() end to end against LocalSMTPServer
+- replies: check_email_replies() end to end against LocalIMAPServer, first
+  (full) scan and the incremental scan after it
+
+Everything runs in a temporary directory, so the real contacts.db,
+emails_output.csv and reply_state.json are never touched. Results are printed
+and can be saved as JSON, then compared against an earlier run:
+
+    python benchmarks.py --rows 10000 100000 --output before.json
+    python benchmarks.py --rows 10000 100000 --compare before.json
+"""
+
+import contextlib
+import csv
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import tempfile
+import time
+import html as html_lib
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from urllib.request import urlopen
+
+import contact_ledger
+import email_notifier
+import metrics
+from email_extractor import extract_emails, extract_emails_batch
+from local_servers import LocalSMTPServer, LocalIMAPServer, LocalSearchPageServer
+from post_filter import PostFilter
+
+POSITIONS = ["Java Developer", "Python Developer", "Data Engineer", "DevOps Engineer", "QA Engineer"]
+
+# Post fields in the synthetic search page markup (what EXTRACT_NEW_POSTS_JS reads in the browser)
+_POST_RE = re.compile(
+    r'<div class="feed-shared-update-v2" data-urn="(?P<urn>[^"]*)">.*?'
+    r'update-components-actor__name">(?P<author>.*?)</span>.*?'
+    r'update-components-actor__description">(?P<headline>.*?)</span>.*?'
+    r'class="break-words">(?P<text>.*?)</span>', re.DOTALL)
+
+
+def parse_search_page(page_html):
+    """Returns [{urn, author, headline, text}] from a synthetic search page."""
+    return [{key: html_lib.unescape(value) for key, value in match.groupdict().items()}
+            for match in _POST_RE.finditer(page_html)]
+
+
+def generate_csv_history(path, rows, days=30, seed=3):
+    """
+    Writes a synthetic emails_output.csv with `rows` contacts spread over the
+    last `days` days, oldest first. About one in five addresses repeats.
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    start = now - timedelta(days=days)
+    step = (now - start) / max(rows, 1)
+    unique = max(int(rows * 0.8), 1)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Email", "Position", "Date/Time"])
+        for index in range(rows):
+            contact = index if index < unique else rng.randrange(unique)
+            writer.writerow([f"recruiter{contact}@agency{contact % 997}.com", rng.choice(POSITIONS),
+                             (start + step * index).strftime('%Y-%m-%d %H:%M:%S')])
+    return path
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    pick = lambda q: samples[min(int(q * len(samples)), len(samples) - 1)]
+    return {'p50_ms': round(pick(0.5) * 1000, 3), 'p90_ms': round(pick(0.9) * 1000, 3),
+            'p99_ms': round(pick(0.99) * 1000, 3)}
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silences the pipeline's per-item prints (they are still paid for)."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _reset_ledger(db_path='contacts.db', csv_path='emails_output.csv'):
+    """Points the process-wide ledger singletons at a fresh database."""
+    if contact_ledger._ledger is not None:
+        contact_ledger._ledger.close()
+    contact_ledger._ledger = contact_ledger.ContactLedger(db_path, csv_path)
+    contact_ledger._contact_index = None
+    contact_ledger._seen_posts = None
+    return contact_ledger._ledger
+
+
+def bench_extraction(pages=40, posts_per_page=25, email_density=0.3):
+    """Fetches synthetic search pages, then times filtering and email extraction."""
+    post_filter = PostFilter(company_blacklist=['Initech', 'Umbrella'], title_blacklist=['w2 only'],
+                             poster_blacklist=['Omar Khan'])
+    with LocalSearchPageServer(posts_per_page, email_density) as server:
+        start = time.perf_counter()
+        page_sources = []
+        for page in range(1, pages + 1):
+            with urlopen(server.search_url(POSITIONS[page % len(POSITIONS)].replace(' ', '+'), page)) as response:
+                page_sources.append(response.read().decode('utf-8'))
+        fetch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    posts = [post for source in page_sources for post in parse_search_page(source)]
+    parse_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    allowed = [post for post in posts if post_filter.allows(post)]
+    filter_seconds = time.perf_counter() - start
+
+    texts = [post['text'] for post in allowed]
+    start = time.perf_counter()
+    batch_emails = extract_emails_batch(texts)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    page_emails = set()
+    for source in page_sources:
+        page_emails |= extract_emails(source)
+    page_source_seconds = time.perf_counter() - start
+
+    text_mb = sum(len(text) for text in texts) / 1048576
+    html_mb = sum(len(source) for source in page_sources) / 1048576
+    return {
+        'pages': pages,
+        'posts': len(posts),
+        'posts_allowed': len(allowed),
+        'emails_from_posts': len(batch_emails),
+        'emails_from_page_source': len(page_emails),
+        'page_fetch_ms': round(fetch_seconds / pages * 1000, 3),
+        'parse_posts_per_s': round(len(posts) / parse_seconds),
+        'filter_posts_per_s': round(len(posts) / filter_seconds),
+        'extract_posts_per_s': round(len(texts) / batch_seconds),
+        'extract_text_mb_per_s': round(text_mb / batch_seconds, 2),
+        'page_source_mb_per_s': round(html_mb / page_source_seconds, 2),
+    }
+
+
+def bench_dedupe(rows, batches=200, batch_size=20):
+    """
+    Builds a ledger from a `rows`-row CSV history, then times
+    save_emails_to_file() on batches where half the addresses are known.
+    """
+    result = {'rows': rows}
+    start = time.perf_counter()
+    generate_csv_history('emails_output.csv', rows)
+    result['generate_csv_s'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    with _quiet():
+        _reset_ledger()
+    result['csv_import_s'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    contact_ledger.get_contact_index(cooldown_days=7)
+    result['index_load_s'] = round(time.perf_counter() - start, 3)
+
+    bot = SimpleNamespace(contact_cooldown_days=7)
+    try:
+        from linkedineasyapply import LinkedinEasyApply
+        save_emails = lambda emails, position: LinkedinEasyApply.save_emails_to_file(bot, emails, position)
+        result['target'] = 'save_emails_to_file'
+    except ImportError:
+        # Without selenium installed the bot module can't be imported; time the same dedupe path directly
+        save_emails = lambda emails, position: contact_ledger.get_contact_index(7).record(emails, position)[0]
+        result['target'] = 'ContactIndex.record'
+
+    # Known addresses come from the last 6 days of history, inside the 7-day cooldown
+    cutoff = (datetime.now() - timedelta(days=6)).strftime('%Y-%m-%d %H:%M:%S')
+    with open('emails_output.csv', 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader)
+        recent = sorted({row[0] for row in reader if row[2] >= cutoff})
+
+    rng = random.Random(5)
+    latencies = []
+    new_contacts = 0
+    for batch in range(batches):
+        known = [rng.choice(recent) for _ in range(batch_size // 2)]
+        fresh = [f"new{batch}_{i}@fresh{i % 13}.io" for i in range(batch_size - len(known))]
+        start = time.perf_counter()
+        with _quiet():
+            logged = save_emails(known + fresh, rng.choice(POSITIONS))
+        latencies.append(time.perf_counter() - start)
+        new_contacts += len(logged)
+
+    result.update(_percentiles(latencies))
+    result['emails_per_s'] = round(batches * batch_size / sum(latencies))
+    result['new_contacts'] = new_contacts
+    return result
+
+
+def bench_send(recipients=200, workers=4, latency=0.005):
+    """Times send_bulk_emails() against the SMTP stand-in."""
+    _reset_ledger('send.db', 'no_history.csv')
+    registry = metrics.enable(os.devnull, os.devnull)
+    registry.reset()
+    with LocalSMTPServer(latency=latency) as smtp:
+        config = smtp.email_config(max_workers=workers)
+        emails = [f"bench{i}@example.com" for i in range(recipients)]
+        start = time.perf_counter()
+        with _quiet():
+            summary = email_notifier.send_bulk_emails(emails, "Benchmark", "Hello " * 200, config=config)
+        elapsed = time.perf_counter() - start
+        connections = smtp.connections
+    result = {
+        'recipients': recipients,
+        'workers': workers,
+        'server_latency_ms': latency * 1000,
+        'sent': summary['sent'],
+        'messages_per_s': round(summary['sent'] / elapsed, 1),
+        'smtp_connections': connections,
+    }
+    result.update(_percentiles(registry.samples.get('smtp_send_seconds', [])))
+    return result
+
+
+def bench_replies(sent=2000, replies=200, noise=2000):
+    """
+    Times check_email_replies() with `sent` recent contacts, `replies` of whom
+    replied, in an inbox that also holds `noise` unrelated messages.
+    """
+    ledger = _reset_ledger('replies.db', 'no_history.csv')
+    contacts = [f"contact{i}@client{i % 101}.com" for i in range(sent)]
+    ledger.record(contacts, POSITIONS[0])
+    ledger.schedule_followups(contacts, POSITIONS[0], datetime.now(), 3)
+
+    with LocalIMAPServer() as imap:
+        rng = random.Random(9)
+        senders = rng.sample(contacts, replies) + [f"newsletter{i}@news.com" for i in range(noise)]
+        rng.shuffle(senders)
+        for sender in senders:
+            imap.deliver(sender)
+        config = dict(imap.email_config_overrides(), sender_email='bot@localhost', sender_password='secret',
+                      reply_state_file='bench_reply_state.json')
+
+        result = {'sent': sent, 'replies': replies, 'inbox_messages': len(senders)}
+        for label in ('full_scan', 'incremental_scan'):
+            before = imap.round_trips
+            start = time.perf_counter()
+            with _quiet():
+                status = email_notifier.check_email_replies(config=config)
+            result[f'{label}_s'] = round(time.perf_counter() - start, 3)
+            result[f'{label}_round_trips'] = imap.round_trips - before
+            if label == 'full_scan':
+                result['replies_found'] = len(status['replied'])
+            imap.deliver(contacts[-1])
+    return result
+
+
+def _environment():
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        revision = ''
+    return {'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 'revision': revision,
+            'python': platform.python_version(), 'platform': platform.platform()}
+
+
+def _print_section(name, result, baseline=None):
+    print(f"\n📊 {name}")
+    for key, value in result.items():
+        line = f"  {key:<26} {value}"
+        previous = (baseline or {}).get(key)
+        if isinstance(value, (int, float)) and isinstance(previous, (int, float)) and previous:
+            line += f"   (was {previous}, x{value / previous:.2f})"
+        print(line)
+
+
+def run(selected, rows_list, output=None, compare=None):
+    baseline = {}
+    if compare:
+        with open(compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('results', {})
+
+    results = {}
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='jobscanner-bench-') as workdir:
+        os.chdir(workdir)
+        try:
+            if 'extraction' in selected:
+                results['extraction'] = bench_extraction()
+            if 'dedupe' in selected:
+                for rows in rows_list:
+                    results[f'dedupe_{rows}'] = bench_dedupe(rows)
+                    for name in ('emails_output.csv', 'contacts.db', 'contacts.db-wal', 'contacts.db-shm'):
+                        if os.path.exists(name):
+                            os.remove(name)
+            if 'send' in selected:
+                results['send'] = bench_send()
+            if 'replies' in selected:
+                results['replies'] = bench_replies()
+        finally:
+            if contact_ledger._ledger is not None:
+                contact_ledger._ledger.close()
+                contact_ledger._ledger = None
+            os.chdir(original_dir)
+
+    for name, result in results.items():
+        _print_section(name, result, baseline.get(name))
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': _environment(), 'results': results}, f, indent=2)
+        print(f"\n💾 Results saved to {output}")
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the scraping and email pipeline")
+    parser.add_argument('--only', nargs='+', choices=['extraction', 'dedupe', 'send', 'replies'],
+                        default=['extraction', 'dedupe', 'send', 'replies'], help="Benchmarks to run")
+    parser.add_argument('--rows', nargs='+', type=int, default=[10000, 100000],
+                        help="CSV history sizes for the dedupe benchmark (e.g. 10000 1000000)")
+    parser.add_argument('--output', help="Save results as JSON")
+    parser.add_argument('--compare', help="Earlier --output file to compare against")
+    args = parser.parse_args()
+    run(args.only, args.rows, args.output, args.compare)
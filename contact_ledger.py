@@ -0,0 +1,534 @@
+"""
+CONTACT_LEDGER.PY - Indexed Store of Emailed Contacts
+======================================================
+SQLite-backed replacement for scanning emails_output.csv on every lookup.
+
+Each logged contact is one row (email, position, sent_at). Indexes on
+(email, position, sent date) and on sent_at turn the bot's hot queries
+into index lookups instead of full-file scans:
+- dedupe before logging (same email + position on the same day)
+- per-position grouping for follow-ups
+
+On first use an existing emails_output.csv is imported once; export_csv()
+writes the ledger back out in the original CSV format.
+
+ContactIndex sits in front of the ledger: a resident dedupe index that
+normalizes addresses and enforces a per-contact cooldown across positions.
+
+SeenPostIndex remembers which search-result posts (activity URNs) were
+already processed for each position, so repeat scans of the same position
+skip them before extracting any text. A post seen under one position is
+still processed under another, since each position has its own template
+and resume.
+
+The followups table tracks each (contact, position) through
+sent -> followup_1 -> ... -> closed, or replied. A contact only enters it
+once its first email is confirmed sent, so logged contacts whose send
+failed or is still queued are never followed up. Its next_due column is
+indexed, so finding the follow-ups that are due costs only the due rows.
+Its open rows are also the addresses the reply checker looks for.
+
+The outbox table is a durable send queue: each job moves pending -> sending
+-> sent, or back to pending with a later next_attempt_at after a failure,
+or to failed once it runs out of attempts. Jobs caught in 'sending' by a
+crash are put back to pending on the next start.
+
+The send_log table records every confirmed send so the daily send limit
+survives restarts; rows older than a day are dropped when it is read.
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class ContactLedger:
+    """
+    Thread-safe ledger of sent contacts.
+
+    Args:
+        db_path: SQLite database file
+        csv_path: Legacy CSV to import on first use
+    """
+
+    def __init__(self, db_path='contacts.db', csv_path='emails_output.csv'):
+        self.db_path = db_path
+        self.csv_path = csv_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+        if not self._get_meta('csv_imported'):
+            self.import_csv(csv_path)
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS contacts (
+                    id INTEGER PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    position TEXT NOT NULL,
+                    sent_at TEXT NOT NULL,
+                    sent_date TEXT NOT NULL
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_contacts_dedupe
+                    ON contacts (email, position, sent_date);
+                CREATE INDEX IF NOT EXISTS idx_contacts_sent_at
+                    ON contacts (sent_at);
+                CREATE TABLE IF NOT EXISTS followups (
+                    email TEXT NOT NULL,
+                    position TEXT NOT NULL,
+                    stage INTEGER NOT NULL DEFAULT 0,
+                    state TEXT NOT NULL,
+                    next_due TEXT,
+                    sent_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (email, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_followups_due
+                    ON followups (next_due) WHERE next_due IS NOT NULL;
+                CREATE TABLE IF NOT EXISTS seen_posts (
+                    position TEXT NOT NULL,
+                    urn TEXT NOT NULL,
+                    seen_at TEXT NOT NULL,
+                    PRIMARY KEY (position, urn)
+                );
+                CREATE INDEX IF NOT EXISTS idx_seen_posts_seen_at
+                    ON seen_posts (seen_at);
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    position TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    attachment_path TEXT,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at TEXT NOT NULL,
+                    last_error TEXT,
+                    enqueued_at TEXT NOT NULL,
+                    enqueued_date TEXT NOT NULL,
+                    sent_at TEXT
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_outbox_dedupe
+                    ON outbox (email, position, enqueued_date);
+                CREATE INDEX IF NOT EXISTS idx_outbox_pending
+                    ON outbox (next_attempt_at) WHERE state = 'pending';
+                CREATE TABLE IF NOT EXISTS send_log (
+                    id INTEGER PRIMARY KEY,
+                    account TEXT NOT NULL,
+                    sent_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_send_log_sent_at
+                    ON send_log (sent_at);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+    def _get_meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def import_csv(self, csv_path):
+        """
+        One-time import of a legacy emails_output.csv. Returns the number of rows added.
+        """
+        imported = 0
+        if os.path.exists(csv_path):
+            with open(csv_path, 'r', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                next(reader, None)  # Skip header
+                rows = []
+                for row in reader:
+                    if len(row) >= 3:
+                        rows.append((row[0], row[1], row[2], row[2].split(' ')[0]))
+            with self._lock, self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO contacts (email, position, sent_at, sent_date) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                imported = self._conn.total_changes - before
+            print(f"📥 Imported {imported} contact(s) from {csv_path} into {self.db_path}")
+        self._set_meta('csv_imported', datetime.now().strftime(DATETIME_FORMAT))
+        return imported
+
+    def record(self, emails, position, when=None):
+        """
+        Logs emails for a position. Returns the ones that were not already
+        logged for this position on the same day.
+        """
+        when = when or datetime.now()
+        sent_at = when.strftime(DATETIME_FORMAT)
+        sent_date = when.strftime('%Y-%m-%d')
+        new_emails = []
+        with self._lock, self._conn:
+            for email in emails:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO contacts (email, position, sent_at, sent_date) VALUES (?, ?, ?, ?)",
+                    (email, position, sent_at, sent_date)
+                )
+                if cursor.rowcount:
+                    new_emails.append(email)
+        return new_emails
+
+    def contacts_since(self, cutoff):
+        """Returns [(email, position, sent datetime)] for contacts logged since cutoff."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT email, position, sent_at FROM contacts WHERE sent_at >= ?",
+                (cutoff.strftime(DATETIME_FORMAT),)
+            ).fetchall()
+        return [(email, position, datetime.strptime(sent_at, DATETIME_FORMAT)) for email, position, sent_at in rows]
+
+    def schedule_followups(self, emails, position, sent_at, first_delay_hours):
+        """
+        Schedules the first follow-up for contacts whose email was confirmed
+        sent at sent_at. Contacts already scheduled for the position are left
+        alone. Returns the number of contacts scheduled.
+        """
+        next_due = (sent_at + timedelta(hours=first_delay_hours)).strftime(DATETIME_FORMAT)
+        now = datetime.now().strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """INSERT OR IGNORE INTO followups (email, position, stage, state, next_due, updated_at, sent_at)
+                   VALUES (?, ?, 0, 'sent', ?, ?, ?)""",
+                [(email.lower(), position, next_due, now, sent_at.strftime(DATETIME_FORMAT)) for email in emails]
+            )
+            return self._conn.total_changes - before
+
+    def awaiting_reply(self):
+        """
+        Returns {lowercase email: earliest confirmed send datetime} for
+        contacts whose follow-ups are still open (not closed or replied).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT email, min(sent_at) FROM followups
+                   WHERE state NOT IN ('closed', 'replied') GROUP BY email"""
+            ).fetchall()
+        return {email: datetime.strptime(sent_at, DATETIME_FORMAT) for email, sent_at in rows}
+
+    def due_followups(self, now=None):
+        """Returns [(email, position, stage)] whose next follow-up is due."""
+        now = now or datetime.now()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT email, position, stage FROM followups WHERE next_due IS NOT NULL AND next_due <= ? ORDER BY next_due",
+                (now.strftime(DATETIME_FORMAT),)
+            ).fetchall()
+
+    def advance_followup(self, email, position, stage, next_due):
+        """
+        Records that follow-up number `stage` was sent. With no next_due the
+        contact is closed.
+        """
+        state = f'followup_{stage}' if next_due else 'closed'
+        next_due = next_due.strftime(DATETIME_FORMAT) if next_due else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE followups SET stage = ?, state = ?, next_due = ?, updated_at = ? WHERE email = ? AND position = ?",
+                (stage, state, next_due, datetime.now().strftime(DATETIME_FORMAT), email, position)
+            )
+
+    def mark_replied(self, emails):
+        """Cancels pending follow-ups for contacts that replied."""
+        now = datetime.now().strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE followups SET state = 'replied', next_due = NULL, updated_at = ? WHERE email = ? AND state != 'replied'",
+                [(now, email.lower()) for email in emails]
+            )
+
+    def seen_posts_since(self, cutoff):
+        """Drops seen-post rows older than cutoff and returns the remaining (position, urn) pairs."""
+        cutoff = cutoff.strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM seen_posts WHERE seen_at < ?", (cutoff,))
+            rows = self._conn.execute("SELECT position, urn FROM seen_posts").fetchall()
+        return set(rows)
+
+    def add_seen_posts(self, position, urns, when=None):
+        seen_at = (when or datetime.now()).strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_posts (position, urn, seen_at) VALUES (?, ?, ?)",
+                [(position, urn, seen_at) for urn in urns]
+            )
+
+    def enqueue_outbox(self, emails, position, subject, body, attachment_path=None, when=None):
+        """
+        Queues one message per email. An email already queued for the
+        position today is ignored. Returns the number of jobs added.
+        """
+        when = when or datetime.now()
+        enqueued_at = when.strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """INSERT OR IGNORE INTO outbox (email, position, subject, body, attachment_path,
+                                                 next_attempt_at, enqueued_at, enqueued_date)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(email, position, subject, body, attachment_path, enqueued_at, enqueued_at,
+                  when.strftime('%Y-%m-%d')) for email in emails]
+            )
+            return self._conn.total_changes - before
+
+    def claim_outbox(self, limit, now=None):
+        """
+        Marks up to `limit` due pending jobs as sending and returns them as
+        [(id, email, position, subject, body, attachment_path, attempts)].
+        """
+        now = (now or datetime.now()).strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                """SELECT id, email, position, subject, body, attachment_path, attempts FROM outbox
+                   WHERE state = 'pending' AND next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT ?""",
+                (now, limit)
+            ).fetchall()
+            self._conn.executemany("UPDATE outbox SET state = 'sending' WHERE id = ?", [(row[0],) for row in rows])
+        return rows
+
+    def complete_outbox(self, job_id, when=None):
+        sent_at = (when or datetime.now()).strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET state = 'sent', attempts = attempts + 1, sent_at = ?, last_error = NULL WHERE id = ?",
+                (sent_at, job_id)
+            )
+
+    def retry_outbox(self, job_id, error, next_attempt, count_attempt=True):
+        """
+        Puts a job back to pending until next_attempt. With no next_attempt
+        the job is marked failed for good.
+        """
+        state = 'pending' if next_attempt else 'failed'
+        next_attempt = next_attempt.strftime(DATETIME_FORMAT) if next_attempt else datetime.now().strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """UPDATE outbox SET state = ?, attempts = attempts + ?, next_attempt_at = ?, last_error = ?
+                   WHERE id = ?""",
+                (state, 1 if count_attempt else 0, next_attempt, error, job_id)
+            )
+
+    def requeue_interrupted_outbox(self):
+        """Returns jobs left in 'sending' by a crash to pending. Returns how many."""
+        with self._lock, self._conn:
+            return self._conn.execute("UPDATE outbox SET state = 'pending' WHERE state = 'sending'").rowcount
+
+    def next_outbox_attempt(self):
+        """Returns when the earliest pending job becomes due, or None if nothing is pending."""
+        with self._lock:
+            row = self._conn.execute("SELECT min(next_attempt_at) FROM outbox WHERE state = 'pending'").fetchone()
+        return datetime.strptime(row[0], DATETIME_FORMAT) if row and row[0] else None
+
+    def outbox_counts(self):
+        """Returns {state: number of jobs}."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT state, count(*) FROM outbox GROUP BY state").fetchall())
+
+    def log_send(self, account, when=None):
+        """Logs one confirmed send from the account, for the daily limit."""
+        sent_at = (when or datetime.now()).strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO send_log (account, sent_at) VALUES (?, ?)", (account, sent_at))
+
+    def sends_since(self, account, cutoff):
+        """Drops send log rows older than cutoff and returns how many sends the account made since."""
+        cutoff = cutoff.strftime(DATETIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM send_log WHERE sent_at < ?", (cutoff,))
+            return self._conn.execute("SELECT count(*) FROM send_log WHERE account = ?", (account,)).fetchone()[0]
+
+    def export_csv(self, csv_path=None):
+        """Writes the whole ledger in the legacy emails_output.csv format."""
+        csv_path = csv_path or self.csv_path
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT email, position, sent_at FROM contacts ORDER BY sent_at, id"
+            ).fetchall()
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Email", "Position", "Date/Time"])
+            writer.writerows(rows)
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_EDGE_JUNK_RE = re.compile(r'^[\s<(\[\'"]+|[\s>)\]\'".,;:!?]+$')
+
+
+def normalize_email(address):
+    """
+    Canonical form used for dedupe: trimmed, lowercase, without a mailto:
+    prefix or the brackets/punctuation the page regex tends to pick up.
+    """
+    address = _EDGE_JUNK_RE.sub('', address.strip())
+    if address.lower().startswith('mailto:'):
+        address = address[7:]
+    return address.lower()
+
+
+class ContactIndex:
+    """
+    In-memory dedupe index, loaded from the ledger once per process and kept
+    current as contacts are recorded.
+
+    A contact is a duplicate if it was already logged for the same position
+    today, or for any position within the last `cooldown_days` days.
+    """
+
+    def __init__(self, ledger, cooldown_days=0):
+        self.ledger = ledger
+        self.cooldown = timedelta(days=cooldown_days)
+        self._last_sent = {}
+        self._logged_today = set()
+        self._lock = threading.RLock()
+
+        now = datetime.now()
+        window_start = min(now - self.cooldown, now.replace(hour=0, minute=0, second=0, microsecond=0))
+        for email, position, sent_at in ledger.contacts_since(window_start):
+            self._remember(normalize_email(email), position, sent_at)
+
+    def _remember(self, email, position, sent_at):
+        if sent_at > self._last_sent.get(email, datetime.min):
+            self._last_sent[email] = sent_at
+        self._logged_today.add((email, position, sent_at.strftime('%Y-%m-%d')))
+
+    def duplicate_reason(self, email, position, now=None):
+        """Returns why a normalized email should be skipped, or None if it is new."""
+        now = now or datetime.now()
+        with self._lock:
+            if (email, position, now.strftime('%Y-%m-%d')) in self._logged_today:
+                return "already logged today"
+            last_sent = self._last_sent.get(email)
+        if last_sent and self.cooldown and now - last_sent < self.cooldown:
+            return f"contacted {last_sent.strftime('%Y-%m-%d')}, in cooldown"
+        return None
+
+    def record(self, emails, position, now=None):
+        """
+        Normalizes, dedupes and logs emails for a position.
+
+        Returns:
+            tuple: (new normalized emails, [(email, reason)] skipped)
+        """
+        now = now or datetime.now()
+        candidates = []
+        skipped = []
+        batch = set()
+        # Check and record under one lock so concurrent searches can't both pass the cooldown
+        with self._lock:
+            for raw in emails:
+                email = normalize_email(raw)
+                if not email or email in batch:
+                    continue
+                batch.add(email)
+                reason = self.duplicate_reason(email, position, now)
+                if reason:
+                    skipped.append((email, reason))
+                else:
+                    candidates.append(email)
+
+            new_emails = self.ledger.record(candidates, position, now)
+            for email in new_emails:
+                self._remember(email, position, now)
+        skipped.extend((email, "already logged today") for email in candidates if email not in new_emails)
+        return new_emails, skipped
+
+
+class SeenPostIndex:
+    """
+    Persistent per-position sets of processed post URNs with TTL eviction.
+
+    The TTL should match the search date filter: a post older than the window
+    can't show up in results again, so remembering it longer is wasted space.
+    """
+
+    def __init__(self, ledger, ttl_days):
+        self.ledger = ledger
+        self.ttl = timedelta(days=ttl_days)
+        self._lock = threading.Lock()
+        self._urns = {}
+        for position, urn in ledger.seen_posts_since(datetime.now() - self.ttl):
+            self._urns.setdefault(position, set()).add(urn)
+
+    def __contains__(self, key):
+        """Checks a (position, urn) pair."""
+        position, urn = key
+        with self._lock:
+            return urn in self._urns.get(position, ())
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(urns) for urns in self._urns.values())
+
+    def known(self, position):
+        """Returns a snapshot of the URNs already processed for a position."""
+        with self._lock:
+            return list(self._urns.get(position, ()))
+
+    def add(self, position, urns):
+        with self._lock:
+            seen = self._urns.setdefault(position, set())
+            fresh = [urn for urn in urns if urn and urn not in seen]
+            seen.update(fresh)
+        if fresh:
+            self.ledger.add_seen_posts(position, fresh)
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+_contact_index = None
+_seen_posts = None
+
+
+def get_ledger():
+    """Returns the process-wide ContactLedger, opening it on first use."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = ContactLedger()
+        return _ledger
+
+
+def get_contact_index(cooldown_days=0):
+    """Returns the process-wide ContactIndex, loading it on first use."""
+    global _contact_index
+    ledger = get_ledger()
+    with _ledger_lock:
+        if _contact_index is None:
+            _contact_index = ContactIndex(ledger, cooldown_days)
+        return _contact_index
+
+
+def get_seen_posts(ttl_days):
+    """Returns the process-wide SeenPostIndex, loading it on first use."""
+    global _seen_posts
+    ledger = get_ledger()
+    with _ledger_lock:
+        if _seen_posts is None:
+            _seen_posts = SeenPostIndex(ledger, ttl_days)
+        return _seen_posts
+
+
+if __name__ == '__main__':
+    # Export the ledger back to CSV for spreadsheets and older tooling
+    count = get_ledger().export_csv()
+    print(f"✅ Exported {count} contact(s) to emails_output.csv")
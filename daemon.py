@@ -0,0 +1,242 @@
+"""
+DAEMON.PY - Long-Running Scheduler
+===================================
+Keeps the bot running as one process instead of a run-once loop that
+restarts everything (config, driver download check, Chrome, login) after
+every error.
+
+- One warm browser and LinkedinEasyApply instance are reused across search
+  cycles; they are only relaunched (and logged in again) if the browser dies
+  or a search fails.
+- With parallelSearch.workers > 1 the workers are not kept warm: each cycle
+  run_parallel_search starts them from copies of the chrome_bot profile and
+  quits them at the end. The main browser is only opened to log that profile
+  in before the first cycle and after a failed one.
+- Search, reply check and follow-ups are independent periodic jobs, each with
+  its own interval plus random jitter. A failing job is retried with
+  exponential backoff without disturbing the others. Follow-ups are held
+  back while the reply check is failing, so nobody who replied gets one.
+- The IMAP reply watcher and the outbox sender, when enabled in email.yaml,
+  are restarted if their threads die.
+
+Configure in config.yaml and start with `python main.py --daemon`:
+
+    daemon:
+      searchIntervalMinutes: 60
+      replyCheckIntervalMinutes: 15
+      followupIntervalMinutes: 30
+      jitter: 0.1          # +/- share of each interval
+      maxBackoffMinutes: 60
+"""
+
+import random
+import threading
+import time
+
+import metrics
+from email_notifier import (check_email_replies, plan_followups, send_planned_followups,
+                            load_email_config, start_reply_watcher, start_outbox_sender)
+from linkedineasyapply import LinkedinEasyApply
+from parallel_search import run_parallel_search
+from selenium.common.exceptions import WebDriverException
+
+
+class PeriodicJob:
+    """A named job that runs every `interval` seconds, +/- `jitter` of the interval."""
+
+    def __init__(self, name, interval, func, jitter=0.1, max_backoff=3600, on_failure=None):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.on_failure = on_failure
+        self.failures = 0
+        self.runs = 0
+        self.next_run = time.monotonic()
+
+    def _delay(self, base):
+        return max(base * (1 + random.uniform(-self.jitter, self.jitter)), 1.0)
+
+    def run(self):
+        """Runs the job once and schedules the next run. Never raises."""
+        start = time.perf_counter()
+        try:
+            with metrics.span(f'job_{self.name}'):
+                self.func()
+        except Exception as e:
+            self.failures += 1
+            metrics.count(f'job_{self.name}_failures')
+            backoff = min(60 * 2 ** (self.failures - 1), self.max_backoff, self.interval)
+            print(f"\n❌ Job '{self.name}' failed ({self.failures} in a row), retrying in {backoff / 60:.1f} min: {e}")
+            if self.on_failure:
+                try:
+                    self.on_failure(e)
+                except Exception as recovery_error:
+                    print(f"⚠️ Recovery for '{self.name}' failed: {recovery_error}")
+            self.next_run = time.monotonic() + self._delay(backoff)
+            return False
+        self.failures = 0
+        self.runs += 1
+        self.next_run = time.monotonic() + self._delay(self.interval)
+        print(f"\n⏱️ Job '{self.name}' finished in {time.perf_counter() - start:.1f}s, "
+              f"next run in {(self.next_run - time.monotonic()) / 60:.1f} min")
+        return True
+
+
+class BrowserSession:
+    """
+    Keeps one logged-in browser and bot alive across search cycles.
+
+    Args:
+        parameters: Validated config.yaml parameters
+        browser_factory: callable() -> WebDriver
+    """
+
+    def __init__(self, parameters, browser_factory):
+        self.parameters = parameters
+        self.browser_factory = browser_factory
+        self.browser = None
+        self.bot = None
+        self.launches = 0
+
+    def _alive(self):
+        try:
+            self.browser.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def ensure(self):
+        """Returns a logged-in bot, launching a new browser only if there is none or it died."""
+        if self.browser is not None and self._alive():
+            return self.bot
+        if self.browser is not None:
+            print("⚠️ Browser is no longer responding, relaunching it")
+        self.close()
+        with metrics.span('init_browser'):
+            self.browser = self.browser_factory()
+        self.launches += 1
+        self.bot = LinkedinEasyApply(self.parameters, self.browser)
+        with metrics.span('login'):
+            self.bot.login()
+            self.bot.security_check()
+        return self.bot
+
+    def close(self):
+        if self.browser is not None:
+            try:
+                self.browser.quit()
+            except Exception:
+                pass
+        self.browser = None
+        self.bot = None
+
+
+class Daemon:
+    """Runs periodic jobs one at a time, earliest due first, until stopped."""
+
+    def __init__(self, jobs, supervisors=()):
+        self.jobs = jobs
+        self.supervisors = supervisors
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        print("\n🛰️ Daemon started with job(s): " + ", ".join(
+            f"{job.name} every {job.interval / 60:.0f} min" for job in self.jobs))
+        while not self._stop_event.is_set():
+            for supervise in self.supervisors:
+                try:
+                    supervise()
+                except Exception as e:
+                    print(f"⚠️ Supervisor check failed: {e}")
+            job = min(self.jobs, key=lambda j: j.next_run)
+            wait = job.next_run - time.monotonic()
+            if wait > 0:
+                # Wake up at least once a minute to supervise background threads
+                self._stop_event.wait(min(wait, 60))
+                continue
+            job.run()
+
+
+def run_daemon(parameters, browser_factory, worker_browser_factory=None):
+    """
+    Runs search, reply check and follow-ups as independent periodic jobs.
+
+    Args:
+        parameters: Validated config.yaml parameters
+        browser_factory: callable() -> WebDriver for the warm browser
+        worker_browser_factory: callable(index, profile_dir) -> WebDriver for
+            parallel search workers (used when parallelSearch.workers > 1;
+            these are started and quit again every search cycle)
+    """
+    settings = parameters.get('daemon', {}) or {}
+    jitter = float(settings.get('jitter', 0.1))
+    max_backoff = float(settings.get('maxBackoffMinutes', 60)) * 60
+    email_config = load_email_config() or {}
+    session = BrowserSession(parameters, browser_factory)
+    background = {'reply_watcher': None, 'outbox': None, 'profile_ready': False, 'replies_checked_at': None}
+    reply_interval = float(settings.get('replyCheckIntervalMinutes', 15)) * 60
+    parallel_workers = (parameters.get('parallelSearch', {}) or {}).get('workers', 1)
+
+    def search():
+        if parallel_workers > 1 and worker_browser_factory:
+            if not background['profile_ready']:
+                # Log the profile in once; workers copy it, so the browser has to let go of it
+                session.ensure()
+                session.close()
+                background['profile_ready'] = True
+            run_parallel_search(parameters, browser_factory=worker_browser_factory, bot_factory=LinkedinEasyApply)
+        else:
+            session.ensure().search_posts()
+        metrics.write_report(outcome='completed', job='search')
+
+    def reply_check():
+        check_email_replies(raise_errors=True)
+        background['replies_checked_at'] = time.monotonic()
+
+    def followups():
+        # Only follow up while replies are known: within two reply check intervals of a successful check
+        checked_at = background['replies_checked_at']
+        if checked_at is None or time.monotonic() - checked_at > 2 * reply_interval:
+            print("⏭️  Skipping follow-ups until replies can be checked")
+            return
+        followup_plan = plan_followups()
+        if followup_plan:
+            print("\n📤 Sending follow-up emails...")
+            send_planned_followups(followup_plan, parameters['personalInfo'])
+
+    def reset_browser(error):
+        print("🔄 Relaunching the browser before the next search")
+        session.close()
+        background['profile_ready'] = False
+
+    def supervise_background():
+        if email_config.get('watch_replies', False):
+            # Returns the running watcher, or starts a new one if it died
+            background['reply_watcher'] = start_reply_watcher(email_config)
+        if email_config.get('use_outbox', False):
+            # Returns the running sender, or starts a new one if it died
+            background['outbox'] = start_outbox_sender(email_config)
+
+    jobs = [
+        PeriodicJob('reply_check', reply_interval, reply_check,
+                    jitter, max_backoff),
+        PeriodicJob('followups', float(settings.get('followupIntervalMinutes', 30)) * 60, followups,
+                    jitter, max_backoff),
+        PeriodicJob('search', float(settings.get('searchIntervalMinutes', 60)) * 60, search,
+                    jitter, max_backoff, on_failure=reset_browser),
+    ]
+    daemon = Daemon(jobs, supervisors=[supervise_background])
+    try:
+        daemon.run()
+    finally:
+        session.close()
+        if background['reply_watcher']:
+            background['reply_watcher'].stop()
+        if background['outbox']:
+            background['outbox'].stop(drain=True)
+    return daemon
@@ -0,0 +1,238 @@
+"""
+EMAIL_EXTRACTOR.PY - Email Address Extraction
+==============================================
+Precompiled matcher for pulling recruiter email addresses out of post text
+or raw HTML.
+
+Compared to the old inline `...@...\\.com` regex it:
+- accepts any domain with a 2-24 letter TLD (.io, .net, .co.uk, ...)
+- decodes HTML entities and mailto: links first
+- understands common obfuscations: "name [at] firm [dot] com",
+  "name(at)firm(dot)com", "name AT firm DOT com" (bare words only in
+  capitals, so prose like "apply at Google dot com" is left alone)
+- stops a domain before a capitalised word run into it ("joe@acme.com.Thanks")
+- strips trailing punctuation and rejects image/asset filenames that look
+  like addresses (logo@2x.png)
+
+extract_emails(text) handles one document; extract_emails_batch(texts) joins
+many post texts and scans them in one pass.
+
+Run this file directly for a throughput benchmark on synthetic corpora:
+
+    python email_extractor.py --mb 20
+"""
+
+import html
+import random
+import re
+import string
+import time
+
+# Local part immediately before an '@' (searched within a 64-char window ending at the '@')
+_LOCAL_TAIL_RE = re.compile(r'[A-Za-z0-9][A-Za-z0-9._%+-]{0,63}\Z')
+# Same, but allowing whitespace before an obfuscated " [at] "
+_OBFUSCATED_LOCAL_TAIL_RE = re.compile(r'([A-Za-z0-9][A-Za-z0-9._%+-]{0,63})\s*\Z')
+
+# Domain immediately after the '@'; must end in a letters-only TLD
+_DOMAIN_RE = re.compile(
+    r'(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+'
+    r'[A-Za-z]{2,24}'
+    r'(?![\w-])'
+)
+
+# Obfuscated "at": [at] (at) {at}, or the bare word AT (capitals only) when dots are spelled out too
+_BRACKET_AT_RE = re.compile(r'[\[({]\s*at\s*[\])}]\s*', re.IGNORECASE)
+_WORD_AT_RE = re.compile(r'\s+AT\s+')
+
+# Domain after an obfuscated "at". Bracketed addresses may mix [dot] and '.';
+# the bare-word form needs spelled-out "DOT" so "APPLY AT careers.acme.com"
+# is not mistaken for an address.
+_BRACKET_DOMAIN_RE = re.compile(
+    r'[A-Za-z0-9-]{1,63}(?:(?:\s*[\[({]\s*dot\s*[\])}]\s*|\s+dot\s+|\.)[A-Za-z0-9-]{1,63})+',
+    re.IGNORECASE
+)
+_WORD_DOMAIN_RE = re.compile(r'[A-Za-z0-9-]{1,63}(?:\s+DOT\s+[A-Za-z0-9-]{1,63})+')
+_DOT_SPLIT_RE = re.compile(r'\s*[\[({]\s*dot\s*[\])}]\s*|\s+dot\s+|\.', re.IGNORECASE)
+_TLD_RE = re.compile(r'[a-z]{2,24}\Z')
+
+# TLDs common in recruiter addresses. A capitalised last label outside this
+# set is taken to be the next sentence ("joe@acme.com.Thanks"), and the
+# bare-word AT form must end in one of them.
+_KNOWN_TLDS = frozenset((
+    'com', 'net', 'org', 'edu', 'gov', 'mil', 'int', 'info', 'biz', 'io', 'ai', 'co', 'us', 'uk', 'ca',
+    'in', 'au', 'de', 'fr', 'nl', 'ie', 'sg', 'ae', 'me', 'tech', 'dev', 'app', 'cloud', 'jobs',
+    'careers', 'consulting', 'solutions', 'services', 'software', 'systems', 'global', 'group',
+    'agency', 'partners', 'digital', 'inc', 'llc', 'xyz',
+))
+# Words that precede a bare AT in prose ("EMAIL ME AT ...") rather than a local part
+_WORD_AT_STOPWORDS = frozenset((
+    'apply', 'applying', 'email', 'mail', 'me', 'us', 'reach', 'contact', 'write', 'send', 'resume',
+    'resumes', 'cv', 'look', 'looking', 'available', 'directly', 'online', 'here', 'or', 'and',
+))
+
+# "addresses" that are really asset filenames, e.g. logo@2x.png
+_ASSET_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.css', '.js')
+
+_TRAILING_JUNK = '.,;:!?)]}>\'"'
+
+
+def _clean(address):
+    address = address.strip().strip(_TRAILING_JUNK).lower()
+    if address.endswith(_ASSET_SUFFIXES):
+        return None
+    local, _, domain = address.partition('@')
+    if not local or '.' not in domain or '..' in address:
+        return None
+    return address
+
+
+def _trim_labels(labels):
+    """Drops trailing capitalised words that are not TLDs, keeping at least two labels."""
+    while (len(labels) > 2 and labels[-1][:1].isupper() and not labels[-1].isupper()
+           and labels[-1].lower() not in _KNOWN_TLDS and _TLD_RE.match(labels[-2].lower())):
+        labels = labels[:-1]
+    return labels
+
+
+def _prepare(text):
+    if '&' in text:
+        text = html.unescape(text)
+    return text.replace('mailto:', ' ')
+
+
+def _scan_plain(text, found):
+    # Jump between '@' signs with str.find and match locally around each one,
+    # instead of running a regex over every character of the document.
+    at = text.find('@')
+    while at != -1:
+        domain = _DOMAIN_RE.match(text, at + 1)
+        if domain:
+            local = _LOCAL_TAIL_RE.search(text, max(0, at - 64), at)
+            if local and (local.start() == 0 or text[local.start() - 1] not in '.%+-'):
+                domain = domain.group()
+                if domain[domain.rfind('.') + 1].isupper():
+                    domain = '.'.join(_trim_labels(domain.split('.')))
+                address = (local.group() + '@' + domain).lower()
+                if not address.endswith(_ASSET_SUFFIXES) and '..' not in address:
+                    found.add(address)
+        at = text.find('@', at + 1)
+
+
+def _scan_obfuscated(text, at_re, domain_re, found, bare_word=False):
+    for at in at_re.finditer(text):
+        local = _OBFUSCATED_LOCAL_TAIL_RE.search(text, max(0, at.start() - 72), at.start())
+        domain = domain_re.match(text, at.end())
+        if not local or not domain:
+            continue
+        parts = _trim_labels([part for part in _DOT_SPLIT_RE.split(domain.group()) if part])
+        if len(parts) < 2 or not _TLD_RE.match(parts[-1].lower()):
+            continue
+        if bare_word and (parts[-1].lower() not in _KNOWN_TLDS
+                          or local.group(1).lower() in _WORD_AT_STOPWORDS):
+            continue
+        address = _clean(f"{local.group(1)}@{'.'.join(parts)}")
+        if address:
+            found.add(address)
+
+
+def _extract(text, found):
+    _scan_plain(text, found)
+
+    lowered = text.lower()
+    if 'at]' in lowered or 'at)' in lowered or 'at}' in lowered or 'at ]' in lowered or 'at )' in lowered:
+        _scan_obfuscated(text, _BRACKET_AT_RE, _BRACKET_DOMAIN_RE, found)
+    if ' DOT ' in text:
+        _scan_obfuscated(text, _WORD_AT_RE, _WORD_DOMAIN_RE, found, bare_word=True)
+
+
+def extract_emails(text):
+    """Returns the set of normalized email addresses in one text or HTML document."""
+    found = set()
+    if text:
+        _extract(_prepare(text), found)
+    return found
+
+
+def extract_emails_batch(texts):
+    """
+    Returns the set of addresses across many post texts, scanned as one
+    document so per-call overhead is paid once per batch.
+    """
+    found = set()
+    joined = '\n'.join(text for text in texts if text)
+    if joined:
+        _extract(_prepare(joined), found)
+    return found
+
+
+def _synthetic_corpus(megabytes, html_markup, address_rate=1.0, seed=7):
+    """
+    Builds a corpus resembling LinkedIn posts. address_rate is the share of
+    posts that include a contact address.
+    """
+    rng = random.Random(seed)
+    words = ["hiring", "c2c", "java", "developer", "remote", "contract", "w2", "urgent",
+             "requirement", "client", "please", "share", "resume", "visa", "onsite"]
+    tlds = ["com", "io", "net", "co.uk", "us", "tech"]
+
+    def address():
+        user = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+        domain = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+        tld = rng.choice(tlds)
+        style = rng.random()
+        if style < 0.15:
+            return f"{user} [at] {domain} [dot] {tld.replace('.', ' [dot] ')}"
+        if style < 0.25:
+            return f"{user}(at){domain}(dot){tld.replace('.', '(dot)')}"
+        return f"{user}@{domain}.{tld}"
+
+    chunks = []
+    size = 0
+    target = int(megabytes * 1024 * 1024)
+    while size < target:
+        sentence = ' '.join(rng.choices(words, k=rng.randint(40, 80)))
+        if rng.random() < address_rate:
+            sentence += f" reach me at {address()}."
+        if html_markup:
+            sentence = (f'<div class="feed-shared-update-v2" data-urn="urn:li:activity:{rng.randint(1, 10**18)}">'
+                        f'<span dir="ltr" class="break-words">{sentence}</span>'
+                        f'<img src="https://media.licdn.com/logo@2x.png"></div>\n')
+        chunks.append(sentence)
+        size += len(sentence)
+    return chunks
+
+
+def _legacy_extract(text):
+    return set(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.com\b', text))
+
+
+def benchmark(megabytes=10):
+    """Prints MB/s and addresses found for the legacy pattern vs this module."""
+    for label, html_markup, address_rate in (
+        ("post text, every post has an address", False, 1.0),
+        ("post text, 1 in 10 posts has an address", False, 0.1),
+        ("search page HTML, every post has an address", True, 1.0),
+        ("search page HTML, 1 in 10 posts has an address", True, 0.1),
+    ):
+        chunks = _synthetic_corpus(megabytes, html_markup, address_rate)
+        corpus = '\n'.join(chunks)
+        size_mb = len(corpus.encode('utf-8')) / (1024 * 1024)
+
+        print(f"\n📊 {label}: {size_mb:.1f} MB, {len(chunks)} posts")
+        for name, run in (
+            ("legacy .com regex", lambda: _legacy_extract(corpus)),
+            ("extract_emails", lambda: extract_emails(corpus)),
+            ("extract_emails_batch", lambda: extract_emails_batch(chunks)),
+        ):
+            start = time.perf_counter()
+            found = run()
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<22} {size_mb / elapsed:8.1f} MB/s  {len(found):7d} addresses")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Email extraction throughput benchmark")
+    parser.add_argument('--mb', type=float, default=10, help="Corpus size in megabytes")
+    args = parser.parse_args()
+    benchmark(args.mb)
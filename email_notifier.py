@@ -8,7 +8,10 @@ Reads configuration from email.yaml and sends emails to recipients.
 import smtplib
 import yaml
 import imaplib
+import socket
 import email
+import email.utils
+import re
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -16,6 +19,13 @@ from email import encoders
 import os
 from datetime import datetime, timedelta
 import time
+import json
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contact_ledger import get_ledger
+import metrics
 
 
 def load_email_config():
@@ -29,7 +39,245 @@ def load_email_config():
         return None
 
 
-def send_email(to_email, subject, body, attachment_path=None):
+class SMTPSession:
+    """
+    Pooled SMTP session that logs in once and reuses the connection.
+
+    The connection is opened lazily on the first send. If the server drops it
+    (or it has been idle longer than max_idle seconds, which is when most
+    providers time clients out), the session reconnects on its own and retries
+    the message once.
+
+    Usage:
+        with SMTPSession(config) as session:
+            send_email(addr, subject, body, session=session)
+    """
+
+    def __init__(self, config, max_idle=240):
+        self.config = config
+        self.sender_email = config['sender_email']
+        self.sender_password = config.get('sender_password')
+        self.smtp_server = config['smtp_server']
+        self.smtp_port = config['smtp_port']
+        self.use_starttls = config.get('smtp_starttls', True)
+        self.max_idle = max_idle
+        self.handshakes = 0
+        self.messages_sent = 0
+        self._server = None
+        self._last_used = 0.0
+
+    @property
+    def handshakes_saved(self):
+        """Handshakes avoided compared to one connection per message."""
+        return max(self.messages_sent - self.handshakes, 0)
+
+    def _connect(self):
+        self.close()
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        if self.use_starttls:
+            server.starttls()
+        if self.sender_password:
+            server.login(self.sender_email, self.sender_password)
+        self._server = server
+        self._last_used = time.monotonic()
+        self.handshakes += 1
+
+    def _ensure_connected(self):
+        if self._server is None or time.monotonic() - self._last_used > self.max_idle:
+            self._connect()
+
+    def send_message(self, msg):
+        """Sends a prepared message, reconnecting once if the connection was lost."""
+        self._ensure_connected()
+        try:
+            self._server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self._connect()
+            self._server.send_message(msg)
+        self._last_used = time.monotonic()
+        self.messages_sent += 1
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: holds up to `capacity` tokens and refills at
+    `rate` tokens per `per` seconds.
+    """
+
+    def __init__(self, rate, per, capacity=None):
+        self.rate = float(rate)
+        self.per = float(per)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+
+    def try_acquire(self):
+        """Takes a token if one is available. Returns True on success."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def wait_time(self):
+        """Seconds until the next token becomes available."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                return 0.0
+            return (1 - self.tokens) * self.per / self.rate
+
+
+class SendRateLimiter:
+    """
+    Per-account send limits from email.yaml.
+
+    max_per_minute blocks the caller until a token is free; max_per_day fails
+    fast instead, since waiting for the daily quota would stall the run for hours.
+
+    max_per_day is a rolling 24 hour count of the confirmed sends in the
+    ledger's send_log, so it holds across restarts. acquire() reserves a slot
+    and release() frees it, logging the send if it went through; reserved
+    slots count against the limit so parallel workers can't overshoot it.
+    """
+
+    def __init__(self, per_minute=None, per_day=None, ledger=None, account=None):
+        self.minute_bucket = TokenBucket(per_minute, 60) if per_minute else None
+        self.per_day = int(per_day) if per_day else None
+        self.ledger = ledger or get_ledger()
+        self.account = account
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks for the per-minute limit. Returns False if the daily quota is
+        used up; otherwise the caller must call release() after the send.
+        """
+        with self._lock:
+            if self.per_day:
+                sent = self.ledger.sends_since(self.account, datetime.now() - timedelta(days=1))
+                if sent + self._reserved >= self.per_day:
+                    return False
+            self._reserved += 1
+        if self.minute_bucket:
+            while not self.minute_bucket.try_acquire():
+                time.sleep(self.minute_bucket.wait_time())
+        return True
+
+    def release(self, sent):
+        """Frees the slot taken by acquire(), logging the send if it succeeded."""
+        with self._lock:
+            if sent:
+                self.ledger.log_send(self.account)
+            self._reserved -= 1
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(config):
+    """Returns the shared SendRateLimiter for the configured sender account."""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(config['sender_email'])
+        if limiter is None:
+            limiter = SendRateLimiter(config.get('max_per_minute'), config.get('max_per_day'),
+                                      account=config['sender_email'])
+            _rate_limiters[config['sender_email']] = limiter
+        return limiter
+
+
+class PreparedMessageCache:
+    """
+    LRU cache of rendered message parts so a batch encodes its resume once.
+
+    Entries are keyed by (subject, body, attachment path, attachment mtime), so
+    editing a resume on disk invalidates it. Each entry holds the text part and
+    the base64-encoded attachment part; build() wraps them in a fresh envelope
+    so only the headers change per recipient.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _render_parts(self, body, attachment_path):
+        parts = [MIMEText(body, 'plain')]
+        if attachment_path:
+            with open(attachment_path, 'rb') as attachment:
+                part = MIMEBase('application', 'octet-stream')
+                part.set_payload(attachment.read())
+                encoders.encode_base64(part)
+                part.add_header(
+                    'Content-Disposition',
+                    f'attachment; filename= {os.path.basename(attachment_path)}'
+                )
+                parts.append(part)
+        return parts
+
+    def get_parts(self, subject, body, attachment_path=None):
+        """Returns the cached [body, attachment] parts, rendering them on a miss."""
+        if attachment_path and not os.path.exists(attachment_path):
+            attachment_path = None
+        mtime = os.path.getmtime(attachment_path) if attachment_path else None
+        key = (subject, body, attachment_path, mtime)
+
+        with self._lock:
+            parts = self._entries.get(key)
+            if parts is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return parts
+            self.misses += 1
+
+            # Render under the lock so concurrent workers encode the file only once
+            parts = self._render_parts(body, attachment_path)
+            self._entries[key] = parts
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return parts
+
+    def build(self, sender_email, to_email, subject, body, attachment_path=None):
+        """Returns a ready-to-send MIMEMultipart addressed to to_email."""
+        msg = MIMEMultipart()
+        msg['From'] = sender_email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        for part in self.get_parts(subject, body, attachment_path):
+            msg.attach(part)
+        return msg
+
+
+_message_cache = PreparedMessageCache()
+
+
+def send_email(to_email, subject, body, attachment_path=None, session=None):
     """
     Send an email using SMTP.
     
@@ -38,85 +286,283 @@ def send_email(to_email, subject, body, attachment_path=None):
         subject: Email subject
         body: Email body text
         attachment_path: Optional path to file attachment
+        session: Optional SMTPSession to reuse; a one-off session is used otherwise
     
     Returns:
         bool: True if sent successfully, False otherwise
     """
-    config = load_email_config()
+    config = session.config if session else load_email_config()
     if not config:
         print("❌ Failed to load email configuration")
         return False
     
     sender_email = config['sender_email']
-    sender_password = config['sender_password']
-    smtp_server = config['smtp_server']
-    smtp_port = config['smtp_port']
     
     try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # Add body
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Add attachment if provided
-        if attachment_path and os.path.exists(attachment_path):
-            with open(attachment_path, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-                encoders.encode_base64(part)
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename= {os.path.basename(attachment_path)}'
-                )
-                msg.attach(part)
+        # Reuse the rendered body and encoded attachment for this template
+        msg = _message_cache.build(sender_email, to_email, subject, body, attachment_path)
         
-        # Connect to server and send
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
+        # Send over the shared session, or a one-off connection
+        start = time.perf_counter()
+        if session:
+            session.send_message(msg)
+        else:
+            with SMTPSession(config) as one_off:
+                one_off.send_message(msg)
+        metrics.observe('smtp_send_seconds', time.perf_counter() - start)
+        metrics.count('emails_sent')
         
         print(f"✅ Email sent successfully to {to_email}")
         return True
         
     except Exception as e:
+        metrics.count('emails_failed')
         print(f"❌ Failed to send email to {to_email}: {e}")
         return False
 
 
-def send_bulk_emails(email_list, subject, body, attachment_path=None):
+def send_bulk_emails(email_list, subject, body, attachment_path=None, config=None, on_sent=None):
     """
     Send the same email to multiple recipients.
     
+    Recipients are spread over `max_workers` threads (email.yaml, default 1),
+    each holding its own SMTPSession, and every send waits on the account's
+    max_per_minute / max_per_day limits.
+    
     Args:
         email_list: List of recipient email addresses
         subject: Email subject
         body: Email body text
         attachment_path: Optional path to file attachment
+        config: Optional email settings dict (defaults to email.yaml)
+        on_sent: Optional callable(address) run right after each successful send
     
     Returns:
-        dict: Summary with 'sent' and 'failed' counts
+        dict: Summary with 'sent' and 'failed' counts, plus per-recipient 'results'
     """
-    sent_count = 0
-    failed_count = 0
+    config = config or load_email_config()
+    if not config:
+        print("❌ Failed to load email configuration")
+        return {'sent': 0, 'failed': len(email_list), 'results': {e: False for e in email_list}}
     
-    print(f"\n📧 Sending emails to {len(email_list)} recipient(s)...")
+    limiter = get_rate_limiter(config)
+    workers = max(int(config.get('max_workers', 1)), 1)
+    sessions = []
+    sessions_lock = threading.Lock()
+    local = threading.local()
     
-    for email in email_list:
-        if send_email(email, subject, body, attachment_path):
-            sent_count += 1
-        else:
-            failed_count += 1
+    def deliver(email_addr):
+        if not limiter.acquire():
+            print(f"⛔ Daily send limit reached, skipping {email_addr}")
+            return False
+        sent = False
+        try:
+            if not hasattr(local, 'session'):
+                local.session = SMTPSession(config)
+                with sessions_lock:
+                    sessions.append(local.session)
+            sent = send_email(email_addr, subject, body, attachment_path, session=local.session)
+        finally:
+            limiter.release(sent)
+        if sent and on_sent:
+            on_sent(email_addr)
+        return sent
+    
+    print(f"\n📧 Sending emails to {len(email_list)} recipient(s) with {workers} worker(s)...")
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = dict(zip(email_list, pool.map(deliver, email_list)))
+    finally:
+        for session in sessions:
+            session.close()
+    
+    sent_count = sum(1 for ok in results.values() if ok)
+    failed_count = len(results) - sent_count
+    handshakes = sum(session.handshakes for session in sessions)
+    handshakes_saved = sum(session.handshakes_saved for session in sessions)
     
     print(f"\n📊 Email Summary:")
     print(f"  ✅ Sent: {sent_count}")
     print(f"  ❌ Failed: {failed_count}")
+    print(f"  🔁 SMTP handshakes: {handshakes} (saved {handshakes_saved})")
+    
+    return {'sent': sent_count, 'failed': failed_count, 'results': results}
+
+
+# Refusals that won't change on retry (bad address, rejected recipient)
+_PERMANENT_SMTP_ERRORS = (smtplib.SMTPRecipientsRefused,)
+
+
+class OutboxSender(threading.Thread):
+    """
+    Background sender that drains the durable outbox in the contact ledger.
+    
+    The scraper only enqueues jobs (enqueue_emails) and moves on; this thread
+    sends them over pooled SMTP sessions with the account's rate limits. A
+    failed send is retried with exponential backoff (outbox_retry_seconds,
+    doubling up to outbox_max_retry_seconds) until outbox_max_attempts, then
+    marked failed. Every state change is committed before the next step, so
+    after a crash the next start resumes with exactly the jobs that were not
+    confirmed sent. A job caught mid-send by a crash is sent again; it keeps
+    the same Message-ID, so mail clients show the copies as one message.
+    
+    Usage:
+        sender = start_outbox_sender(config)
+        enqueue_emails(emails, position, subject, body, resume_path)
+        ...
+        sender.stop(drain=True)
+    """
+
+    def __init__(self, config, ledger=None, poll_interval=5.0):
+        super().__init__(name='OutboxSender', daemon=True)
+        self.config = config
+        self.ledger = ledger or get_ledger()
+        self.poll_interval = poll_interval
+        self.workers = max(int(config.get('max_workers', 1)), 1)
+        self.max_attempts = int(config.get('outbox_max_attempts', 5))
+        self.retry_seconds = float(config.get('outbox_retry_seconds', 30))
+        self.max_retry_seconds = float(config.get('outbox_max_retry_seconds', 3600))
+        self.limiter = get_rate_limiter(config)
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._drain = False
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        
+        resumed = self.ledger.requeue_interrupted_outbox()
+        if resumed:
+            print(f"📮 Resuming {resumed} outbox job(s) interrupted by the last run")
+    
+    def wake(self):
+        """Signals that new jobs were enqueued."""
+        self._wake.set()
+    
+    def stop(self, drain=False, timeout=None):
+        """
+        Stops the sender. With drain=True it first sends every job that is due
+        now (jobs waiting on a retry delay stay queued for the next run).
+        """
+        self._drain = drain
+        self._stop_event.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+    
+    def _backoff(self, attempts):
+        delay = min(self.retry_seconds * (2 ** (attempts - 1)), self.max_retry_seconds)
+        return datetime.now() + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+    
+    def _session(self):
+        if not hasattr(self._local, 'session'):
+            self._local.session = SMTPSession(self.config)
+            with self._sessions_lock:
+                self._sessions.append(self._local.session)
+        return self._local.session
+    
+    def _deliver(self, job):
+        job_id, to_email, position, subject, body, attachment_path, attempts = job
+        if not self.limiter.acquire():
+            # Daily quota used up: try again later without spending an attempt
+            self.ledger.retry_outbox(job_id, "daily send limit reached", datetime.now() + timedelta(hours=1),
+                                     count_attempt=False)
+            return
+        try:
+            msg = _message_cache.build(self.config['sender_email'], to_email, subject, body, attachment_path)
+            msg['Message-ID'] = _outbox_message_id(job_id, self.config['sender_email'])
+            start = time.perf_counter()
+            self._session().send_message(msg)
+            metrics.observe('smtp_send_seconds', time.perf_counter() - start)
+        except Exception as e:
+            self.limiter.release(False)
+            metrics.count('emails_failed')
+            attempts += 1
+            permanent = isinstance(e, _PERMANENT_SMTP_ERRORS)
+            if permanent or attempts >= self.max_attempts:
+                self.ledger.retry_outbox(job_id, str(e), None)
+                self.failed += 1
+                print(f"❌ Giving up on {to_email} after {attempts} attempt(s): {e}")
+            else:
+                self.ledger.retry_outbox(job_id, str(e), self._backoff(attempts))
+                self.retried += 1
+                print(f"⚠️ Send to {to_email} failed (attempt {attempts}), will retry: {e}")
+            return
+        self.limiter.release(True)
+        self.ledger.complete_outbox(job_id)
+        schedule_followups([to_email], position, self.config, self.ledger)
+        metrics.count('emails_sent')
+        self.sent += 1
+        print(f"✅ Email sent successfully to {to_email} ({position})")
+    
+    def run(self):
+        print(f"📮 Outbox sender started with {self.workers} worker(s)")
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while True:
+                    if self._stop_event.is_set() and not self._drain:
+                        break
+                    jobs = self.ledger.claim_outbox(self.workers * 4)
+                    if jobs:
+                        list(pool.map(self._deliver, jobs))
+                        continue
+                    if self._stop_event.is_set():
+                        break
+                    self._wake.wait(self._idle_wait())
+                    self._wake.clear()
+        finally:
+            for session in self._sessions:
+                session.close()
+            counts = self.ledger.outbox_counts()
+            print(f"📮 Outbox sender stopped: {self.sent} sent, {self.retried} retried, {self.failed} failed; "
+                  f"{counts.get('pending', 0)} still queued")
     
-    return {'sent': sent_count, 'failed': failed_count}
+    def _idle_wait(self):
+        next_attempt = self.ledger.next_outbox_attempt()
+        if next_attempt is None:
+            return self.poll_interval
+        return min(max((next_attempt - datetime.now()).total_seconds(), 0.1), self.poll_interval)
+
+
+def _outbox_message_id(job_id, sender_email):
+    """Stable Message-ID per outbox job, so a resend after a crash is the same message."""
+    domain = sender_email.rpartition('@')[2] or 'localhost'
+    return f"<outbox-{job_id}@{domain}>"
+
+
+_outbox_sender = None
+_outbox_lock = threading.Lock()
+
+
+def start_outbox_sender(config):
+    """Starts the process-wide OutboxSender, or returns the one already running."""
+    global _outbox_sender
+    with _outbox_lock:
+        if _outbox_sender is None or not _outbox_sender.is_alive():
+            _outbox_sender = OutboxSender(config)
+            _outbox_sender.start()
+        return _outbox_sender
+
+
+def outbox_running():
+    with _outbox_lock:
+        return _outbox_sender is not None and _outbox_sender.is_alive()
+
+
+def enqueue_emails(email_list, position, subject, body, attachment_path=None):
+    """
+    Queues emails in the durable outbox for the background sender.
+    Returns the number of jobs added (already-queued recipients are skipped).
+    """
+    queued = get_ledger().enqueue_outbox(email_list, position, subject, body, attachment_path)
+    with _outbox_lock:
+        if _outbox_sender is not None:
+            _outbox_sender.wake()
+    print(f"📮 Queued {queued} email(s) for {position} ({len(email_list) - queued} already queued)")
+    return queued
 
 
 def create_email_template(position, personal_info):
@@ -155,88 +601,407 @@ Best regards,
     return subject, body
 
 
-def check_email_replies(hours=3):
+def open_imap(config):
+    """
+    Opens and logs in an IMAP connection for the configured account.
+    
+    imap_server / imap_port / imap_ssl in email.yaml default to Gmail over SSL.
+    """
+    host = config.get('imap_server', 'imap.gmail.com')
+    if config.get('imap_ssl', True):
+        imap = imaplib.IMAP4_SSL(host, config.get('imap_port', 993))
+    else:
+        imap = imaplib.IMAP4(host, config.get('imap_port', 143))
+    imap.login(config['sender_email'], config['sender_password'])
+    return imap
+
+
+def _compress_uid_set(uids):
+    """Turns [1, 2, 3, 7, 9, 10] into '1:3,7,9:10' to keep commands short."""
+    uids = sorted(set(int(uid) for uid in uids))
+    ranges = []
+    for uid in uids:
+        if ranges and uid == ranges[-1][1] + 1:
+            ranges[-1][1] = uid
+        else:
+            ranges.append([uid, uid])
+    return ','.join(str(low) if low == high else f"{low}:{high}" for low, high in ranges)
+
+
+_FETCH_UID_RE = re.compile(rb'UID (\d+)')
+
+
+class ReplyScanner:
+    """
+    Detects replies with a fixed number of IMAP round trips per check.
+    
+    Instead of one SEARCH (and STOREs) per outstanding address, it:
+      1. UID SEARCHes messages SINCE the earliest send date,
+      2. fetches only their From headers in one batched UID FETCH,
+      3. matches senders locally against a set of outstanding addresses,
+      4. flags every reply with a single batched UID STORE.
+    """
+
+    def __init__(self, imap):
+        self.imap = imap
+        self.round_trips = 0
+
+    def _command(self, *args):
+        self.round_trips += 1
+        metrics.count('imap_round_trips')
+        status, data = self.imap.uid(*args)
+        if status != 'OK':
+            raise imaplib.IMAP4.error(f"UID {args[0]} failed: {data}")
+        return data
+
+    def search_since(self, since):
+        """Returns the UIDs of messages received on or after `since`."""
+        data = self._command('SEARCH', None, f'SINCE {since.strftime("%d-%b-%Y")}')
+        return data[0].split() if data and data[0] else []
+
+    def fetch_senders(self, uids):
+        """Returns {uid: lowercase sender address} for the given UIDs."""
+        if not uids:
+            return {}
+        data = self._command('FETCH', _compress_uid_set(uids), '(UID BODY.PEEK[HEADER.FIELDS (FROM)])')
+        senders = {}
+        for item in data:
+            if not isinstance(item, tuple):
+                continue
+            match = _FETCH_UID_RE.search(item[0])
+            if not match:
+                continue
+            header = email.message_from_bytes(item[1])
+            _, addr = email.utils.parseaddr(header.get('From', ''))
+            if addr:
+                senders[int(match.group(1))] = addr.lower()
+        return senders
+
+    def search_after(self, last_uid):
+        """Returns the UIDs of messages newer than last_uid."""
+        data = self._command('SEARCH', None, f'UID {int(last_uid) + 1}:*')
+        uids = data[0].split() if data and data[0] else []
+        # "n:*" always matches the newest message, even when its UID is below n
+        return [uid for uid in uids if int(uid) > int(last_uid)]
+
+    def flag(self, uids):
+        """Stars all given messages with one STORE."""
+        if uids:
+            self._command('STORE', _compress_uid_set(uids), '+FLAGS', '(\\Flagged)')
+
+    def scan(self, sent_emails):
+        """
+        Args:
+            sent_emails: {lowercase address: sent datetime}
+        
+        Returns:
+            set: Addresses from sent_emails that have replied
+        """
+        if not sent_emails:
+            return set()
+        outstanding = set(sent_emails)
+        since = min(sent_emails.values())
+        senders = self.fetch_senders(self.search_since(since))
+        reply_uids = [uid for uid, addr in senders.items() if addr in outstanding]
+        self.flag(reply_uids)
+        return {senders[uid] for uid in reply_uids}
+
+    def scan_incremental(self, sent_emails, state, uid_validity):
+        """
+        Like scan(), but only fetches messages that arrived since the last
+        checkpoint in `state`. Falls back to a full scan when UIDVALIDITY
+        changed (the server renumbered the mailbox) or there is no checkpoint.
+        
+        A reply only counts if it was first seen at or after the contact's
+        send time, so a reply to an earlier email doesn't close out a newer
+        one. Replies from addresses no longer in sent_emails are pruned.
+        
+        Returns:
+            set: Addresses from sent_emails that have replied, in this or earlier runs
+        """
+        state.replied = {addr: seen for addr, seen in state.replied.items() if addr in sent_emails}
+        if not sent_emails:
+            return set()
+        replied = {addr for addr, seen in state.replied.items()
+                   if datetime.strptime(seen, '%Y-%m-%d %H:%M:%S') >= sent_emails[addr]}
+        outstanding = set(sent_emails) - replied
+
+        if state.uid_validity == uid_validity and state.last_uid:
+            uids = self.search_after(state.last_uid)
+        else:
+            if state.uid_validity not in (None, uid_validity):
+                print("  🔄 Mailbox UIDVALIDITY changed, rescanning")
+            uids = self.search_since(min(sent_emails.values()))
+
+        senders = self.fetch_senders(uids)
+        reply_uids = [uid for uid, addr in senders.items() if addr in outstanding]
+        self.flag(reply_uids)
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for uid in reply_uids:
+            state.replied[senders[uid]] = now
+            replied.add(senders[uid])
+        state.uid_validity = uid_validity
+        if uids:
+            state.last_uid = max([state.last_uid or 0] + [int(uid) for uid in uids])
+
+        return replied
+
+
+class ReplyState:
+    """
+    Reply checker checkpoint saved between runs (reply_state.json).
+    
+    Holds the mailbox UIDVALIDITY, the highest UID already scanned and the
+    contacts still awaiting a reply that have replied, with the time the reply
+    was first seen.
+    """
+
+    def __init__(self, path='reply_state.json'):
+        self.path = path
+        self.uid_validity = None
+        self.last_uid = 0
+        self.replied = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.uid_validity = data.get('uid_validity')
+                self.last_uid = data.get('last_uid', 0)
+                self.replied = data.get('replied', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not read {path}, starting fresh: {e}")
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'uid_validity': self.uid_validity,
+                'last_uid': self.last_uid,
+                'replied': self.replied,
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+def _selected_uid_validity(imap):
+    """Returns the UIDVALIDITY reported by the last SELECT."""
+    _, data = imap.response('UIDVALIDITY')
+    return int(data[0]) if data and data[0] else None
+
+
+def load_awaiting_reply():
+    """
+    Returns {lowercase address: sent datetime} for contacts whose follow-ups
+    are still open, however long ago they were emailed.
+    """
+    return get_ledger().awaiting_reply()
+
+
+# Serializes reply_state.json updates between check_email_replies and ReplyWatcher
+_reply_state_lock = threading.Lock()
+
+
+def check_email_replies(hours=None, config=None, raise_errors=False):
     """
-    Check Gmail inbox for replies to emails sent in the last X hours.
+    Check Gmail inbox for replies from contacts that may still get a follow-up.
     
     Args:
-        hours: How many hours back to check for sent emails
+        hours: Deprecated and ignored; every contact with open follow-ups is
+            checked, however long ago it was emailed
+        config: Optional email settings dict (defaults to email.yaml)
+        raise_errors: Re-raise connection and IMAP errors instead of
+            reporting no replies (for callers with their own retry)
     
     Returns:
         dict: {'replied': [emails], 'no_reply': [emails]}
     """
-    config = load_email_config()
+    config = config or load_email_config()
     if not config:
+        if raise_errors:
+            raise RuntimeError("Failed to load email configuration")
         print("❌ Failed to load email configuration")
         return {'replied': [], 'no_reply': []}
     
-    sender_email = config['sender_email']
-    sender_password = config['sender_password']
-    
     try:
-        # Connect to Gmail IMAP
-        imap = imaplib.IMAP4_SSL('imap.gmail.com')
-        imap.login(sender_email, sender_password)
+        sent_emails = load_awaiting_reply()
         
-        # Select inbox
-        imap.select('INBOX')
+        print(f"\n📬 Checking replies for {len(sent_emails)} contact(s) awaiting a reply...")
         
-        # Get sent emails from CSV to check
-        import csv
-        sent_emails = {}
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        # Connect to IMAP and scan only what arrived since the last checkpoint
+        with metrics.span('imap_reply_check'):
+            imap = open_imap(config)
+            imap.select('INBOX')
+            scanner = ReplyScanner(imap)
+            with _reply_state_lock:
+                state = ReplyState(config.get('reply_state_file', 'reply_state.json'))
+                replied = scanner.scan_incremental(sent_emails, state, _selected_uid_validity(imap))
+                state.save()
+            
+            imap.close()
+            imap.logout()
         
-        if os.path.exists('emails_output.csv'):
-            with open('emails_output.csv', 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader, None)  # Skip header
-                for row in reader:
-                    if len(row) >= 3:
-                        email_addr = row[0]
-                        sent_time = datetime.strptime(row[2], '%Y-%m-%d %H:%M:%S')
-                        if sent_time >= cutoff_time:
-                            sent_emails[email_addr.lower()] = sent_time
-        
-        print(f"\n📬 Checking replies for {len(sent_emails)} email(s) sent in last {hours} hours...")
-        
-        replied_emails = []
-        
-        # Search for emails from the addresses we sent to
-        for email_addr in sent_emails.keys():
-            try:
-                # Search for emails from this address
-                _, message_ids = imap.search(None, f'FROM "{email_addr}"')
-                
-                if message_ids[0]:
-                    # Found reply
-                    replied_emails.append(email_addr)
-                    print(f"  ✅ Reply received from: {email_addr}")
-                    
-                    # Star/flag the email
-                    for msg_id in message_ids[0].split():
-                        imap.store(msg_id, '+FLAGS', '\\Flagged')
-                    
-            except Exception as e:
-                print(f"  ⚠️ Error checking {email_addr}: {e}")
-        
-        # Determine who didn't reply
-        no_reply = [email for email in sent_emails.keys() if email not in replied_emails]
-        
-        imap.close()
-        imap.logout()
+        replied_emails = [email for email in sent_emails.keys() if email in replied]
+        no_reply = [email for email in sent_emails.keys() if email not in replied]
+        get_ledger().mark_replied(replied_emails)
+        for email_addr in replied_emails:
+            print(f"  ✅ Reply received from: {email_addr}")
         
+        metrics.count('replies_found', len(replied_emails))
         print(f"\n📊 Reply Summary:")
         print(f"  ✅ Replied: {len(replied_emails)}")
         print(f"  ⏳ No reply yet: {len(no_reply)}")
+        print(f"  🔁 IMAP round trips: {scanner.round_trips}")
         
         return {'replied': replied_emails, 'no_reply': no_reply}
         
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"❌ Error checking emails: {e}")
         return {'replied': [], 'no_reply': []}
 
 
-def send_followup_emails(no_reply_emails, position, personal_info):
+class ReplyWatcher(threading.Thread):
+    """
+    Long-running reply watcher that holds an IMAP IDLE connection.
+    
+    The server pushes "* n EXISTS" as soon as mail arrives; the watcher then
+    runs an incremental scan, records replies in reply_state.json (which keeps
+    those contacts out of future follow-ups) and calls on_reply with the newly
+    replied addresses. Pending follow-ups for those contacts are cancelled in
+    the ledger. IDLE is re-issued every `idle_timeout` seconds, below the
+    29 minutes after which servers drop idle clients. Runs as a daemon thread
+    so it never blocks the scraper; connection errors are retried after a pause.
+    
+    Usage:
+        watcher = start_reply_watcher(config)
+        ...
+        watcher.stop()
+    """
+
+    def __init__(self, config, on_reply=None, idle_timeout=1500, poll_interval=1.0):
+        super().__init__(name='ReplyWatcher', daemon=True)
+        self.config = config
+        self.on_reply = on_reply
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.replies_seen = 0
+        self._stop_event = threading.Event()
+        self._imap = None
+        self._uid_validity = None
+
+    def stop(self, timeout=5):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        print("👀 Reply watcher started")
+        while not self._stop_event.is_set():
+            try:
+                self._imap = open_imap(self.config)
+                self._imap.select('INBOX')
+                self._uid_validity = _selected_uid_validity(self._imap)
+                self._scan()
+                while not self._stop_event.is_set():
+                    if self._idle():
+                        self._scan()
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                print(f"⚠️ Reply watcher error, reconnecting in 30s: {e}")
+                self._stop_event.wait(30)
+            finally:
+                self._logout()
+        print("👀 Reply watcher stopped")
+
+    def _logout(self):
+        if self._imap is not None:
+            try:
+                self._imap.logout()
+            except Exception:
+                pass
+            self._imap = None
+
+    def _scan(self):
+        sent_emails = load_awaiting_reply()
+        with _reply_state_lock:
+            state = ReplyState(self.config.get('reply_state_file', 'reply_state.json'))
+            before = dict(state.replied)
+            scanner = ReplyScanner(self._imap)
+            scanner.scan_incremental(sent_emails, state, self._uid_validity)
+            state.save()
+        new_replies = [addr for addr, seen in state.replied.items() if before.get(addr) != seen]
+        for addr in new_replies:
+            print(f"  ✅ Reply received from: {addr}")
+        self.replies_seen += len(new_replies)
+        if new_replies:
+            get_ledger().mark_replied(new_replies)
+        if new_replies and self.on_reply:
+            self.on_reply(new_replies)
+
+    def _readline(self):
+        """Reads one server line, or returns None if nothing arrived within poll_interval."""
+        imap = self._imap
+        imap.sock.settimeout(self.poll_interval)
+        try:
+            return imap.readline()
+        except socket.timeout:
+            # A timed-out socket file refuses further reads, so open a fresh one
+            imap.file = imap.sock.makefile('rb')
+            return None
+        finally:
+            imap.sock.settimeout(None)
+
+    def _idle(self):
+        """
+        Runs one IDLE cycle. Returns True if new mail was announced.
+        """
+        imap = self._imap
+        tag = imap._new_tag()
+        imap.send(tag + b' IDLE\r\n')
+        if not imap.readline().startswith(b'+'):
+            raise imaplib.IMAP4.error("server refused IDLE")
+
+        new_mail = False
+        deadline = time.monotonic() + self.idle_timeout
+        while not self._stop_event.is_set() and time.monotonic() < deadline:
+            line = self._readline()
+            if line is None:
+                continue
+            if not line:
+                raise imaplib.IMAP4.abort("connection closed during IDLE")
+            if line.startswith(b'*') and b'EXISTS' in line:
+                new_mail = True
+                break
+
+        imap.send(b'DONE\r\n')
+        while True:
+            line = imap.readline()
+            if not line:
+                raise imaplib.IMAP4.abort("connection closed after IDLE")
+            if line.startswith(tag):
+                break
+        return new_mail
+
+
+_reply_watcher = None
+_reply_watcher_lock = threading.Lock()
+
+
+def start_reply_watcher(config):
+    """Starts the process-wide ReplyWatcher, or returns the one already running."""
+    global _reply_watcher
+    with _reply_watcher_lock:
+        if _reply_watcher is None or not _reply_watcher.is_alive():
+            if _reply_watcher is not None:
+                print("⚠️ Reply watcher stopped, restarting it")
+            _reply_watcher = ReplyWatcher(config)
+            _reply_watcher.start()
+        return _reply_watcher
+
+
+def send_followup_emails(no_reply_emails, position, personal_info, config=None):
     """
     Send follow-up emails to contacts who haven't replied.
     
@@ -244,10 +1009,14 @@ def send_followup_emails(no_reply_emails, position, personal_info):
         no_reply_emails: List of email addresses
         position: Job position
         personal_info: Personal information dict
+        config: Optional email settings dict (defaults to email.yaml)
+    
+    Returns:
+        dict: Summary from send_bulk_emails
     """
     if not no_reply_emails:
         print("✅ No follow-up emails needed")
-        return
+        return {'sent': 0, 'failed': 0, 'results': {}}
     
     first_name = personal_info.get('First Name', 'Your Name')
     last_name = personal_info.get('Last Name', '')
@@ -271,14 +1040,92 @@ Best regards,
     
     print(f"\n📧 Sending follow-up emails to {len(no_reply_emails)} recipient(s)...")
     
-    sent_count = 0
-    for email_addr in no_reply_emails:
-        if send_email(email_addr, subject, body):
-            sent_count += 1
+    summary = send_bulk_emails(no_reply_emails, subject, body, config=config)
+    
+    print(f"✅ Sent {summary['sent']} follow-up email(s)")
+    return summary
+
+
+def get_followup_delays(config):
+    """
+    Hours to wait before each follow-up (followup_delays_hours in email.yaml).
+    
+    The first delay counts from the original email, each later one from the
+    previous follow-up. Its length is the maximum number of follow-ups.
+    """
+    return [float(hours) for hours in config.get('followup_delays_hours', [3, 48])]
+
+
+def schedule_followups(email_list, position, config=None, ledger=None, when=None):
+    """
+    Schedules the first follow-up for contacts whose first email was
+    confirmed sent. Returns the number of contacts scheduled.
+    """
+    config = config or load_email_config() or {}
+    delays = get_followup_delays(config)
+    if not delays or not email_list:
+        return 0
+    return (ledger or get_ledger()).schedule_followups(email_list, position, when or datetime.now(), delays[0])
+
+
+def plan_followups(reply_status=None, config=None, now=None):
+    """
+    Collects the follow-ups that are due, grouped by position.
+    
+    Contacts are scheduled when their first email is confirmed sent
+    (schedule_followups); here repliers from reply_status are closed out,
+    then only the due rows are read through the next_due index.
+    
+    Args:
+        reply_status: Optional result of check_email_replies()
+        config: Optional email settings dict (defaults to email.yaml)
+        now: Optional time to plan for
+    
+    Returns:
+        dict: {position: {email: follow-ups already sent}}
+    """
+    config = config or load_email_config() or {}
+    delays = get_followup_delays(config)
+    if not delays:
+        return {}
+    
+    ledger = get_ledger()
+    replied = set(reply_status['replied']) if reply_status else set()
+    if replied:
+        ledger.mark_replied(replied)
     
-    print(f"✅ Sent {sent_count} follow-up email(s)")
+    plan = {}
+    for email_addr, position, stage in ledger.due_followups(now):
+        if email_addr not in replied:
+            plan.setdefault(position, {})[email_addr] = stage
+    return plan
 
 
+def send_planned_followups(plan, personal_info, config=None):
+    """
+    Sends every batch from plan_followups() through the bulk sender and moves
+    each contact that was reached to its next follow-up stage (or closes it).
+    
+    Returns:
+        dict: {position: send summary}
+    """
+    config = config or load_email_config()
+    delays = get_followup_delays(config or {})
+    ledger = get_ledger()
+    summaries = {}
+    for position, batch in plan.items():
+        print(f"\n📋 Position: {position}")
+        summary = send_followup_emails(list(batch), position, personal_info, config)
+        now = datetime.now()
+        for email_addr, ok in summary.get('results', {}).items():
+            if not ok:
+                continue
+            stage = batch[email_addr] + 1
+            next_due = now + timedelta(hours=delays[stage]) if stage < len(delays) else None
+            ledger.advance_followup(email_addr, position, stage, next_due)
+        summaries[position] = summary
+    return summaries
+
 if __name__ == '__main__':
     # Test the email functionality
     config = load_email_config()
@@ -0,0 +1,217 @@
+"""
+LEAN_BROWSER.PY - Lightweight Scraping Browser Mode
+====================================================
+The scraper only needs post text, but a stock Chrome also downloads every
+image, video, web font and tracking script on the search results page.
+
+Lean mode trims that:
+- Chrome preferences turn off image loading and autoplay
+- CDP Network.setBlockedURLs drops media, fonts and known tracker requests
+  before they leave the browser
+- optionally runs headless
+
+Page weight reporting reads Chrome's performance log (CDP Network events) to
+count bytes transferred, requests made and requests blocked for each search
+page, plus page-load time from Navigation Timing. Turn reporting on with lean
+mode off and on to compare; every measurement is appended to page_weight.jsonl
+tagged with the mode.
+
+Configure in config.yaml:
+
+    leanBrowser:
+      enabled: true
+      headless: false
+      block: [images, media, fonts, trackers]
+      report: true
+"""
+
+import json
+import threading
+from datetime import datetime
+
+from selenium.common.exceptions import WebDriverException
+
+# URL patterns for Network.setBlockedURLs ('*' is a wildcard)
+BLOCKED_URL_PATTERNS = {
+    'images': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.avif',
+               '*media.licdn.com/dms/image*'],
+    'media': ['*.mp4', '*.webm', '*.m3u8', '*.ts', '*.mp3', '*dms.licdn.com/playlist*'],
+    'fonts': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'trackers': ['*doubleclick.net*', '*google-analytics.com*', '*googletagmanager.com*',
+                 '*px.ads.linkedin.com*', '*snap.licdn.com/li.lms-analytics*', '*bat.bing.com*',
+                 '*facebook.net*', '*connect.facebook.com*', '*linkedin.com/li/track*',
+                 '*linkedin.com/realtime/*', '*linkedin.com/tscp-serving*'],
+}
+
+DEFAULT_BLOCK = ('images', 'media', 'fonts', 'trackers')
+
+NAVIGATION_TIMING_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav ? [nav.domContentLoadedEventEnd, nav.loadEventEnd] : [0, 0];
+"""
+
+
+def lean_settings(parameters):
+    """Returns the leanBrowser section of config.yaml with defaults filled in."""
+    settings = dict(parameters.get('leanBrowser', {}) or {})
+    settings.setdefault('enabled', False)
+    settings.setdefault('headless', False)
+    settings.setdefault('block', list(DEFAULT_BLOCK))
+    settings.setdefault('report', False)
+    return settings
+
+
+def blocked_url_patterns(block):
+    patterns = []
+    for category in block:
+        if category not in BLOCKED_URL_PATTERNS:
+            print(f"⚠️ Unknown leanBrowser block category '{category}', ignoring")
+            continue
+        patterns.extend(BLOCKED_URL_PATTERNS[category])
+    return patterns
+
+
+def apply_browser_options(browser_options, settings):
+    """Adds lean mode preferences and page weight logging to ChromeOptions."""
+    if settings.get('report'):
+        browser_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    if not settings.get('enabled'):
+        return browser_options
+
+    prefs = {'profile.default_content_setting_values.notifications': 2}
+    if 'images' in settings['block']:
+        prefs['profile.managed_default_content_settings.images'] = 2
+        browser_options.add_argument('--blink-settings=imagesEnabled=false')
+    browser_options.add_experimental_option('prefs', prefs)
+    if 'media' in settings['block']:
+        browser_options.add_argument('--autoplay-policy=user-gesture-required')
+        browser_options.add_argument('--mute-audio')
+    if settings.get('headless'):
+        browser_options.add_argument('--headless=new')
+        browser_options.add_argument('--window-size=1920,1080')
+    return browser_options
+
+
+def enable_request_blocking(driver, settings):
+    """Installs the CDP URL block list on a started driver. Returns the number of patterns."""
+    if not settings.get('enabled'):
+        return 0
+    patterns = blocked_url_patterns(settings['block'])
+    if patterns:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    return len(patterns)
+
+
+class PageWeightMeter:
+    """
+    Measures bytes and requests per page from Chrome's performance log.
+
+    Call start() right before navigating and measure(label) once the page has
+    been scraped; each measurement covers everything in between, scrolling
+    included.
+    """
+
+    def __init__(self, driver, lean, log_path='page_weight.jsonl'):
+        self.driver = driver
+        self.mode = 'lean' if lean else 'full'
+        self.log_path = log_path
+        self.pages = []
+        self._lock = threading.Lock()
+
+    def _drain(self):
+        try:
+            return self.driver.get_log('performance')
+        except WebDriverException as e:
+            print(f"⚠️ Performance log unavailable: {e}")
+            return []
+
+    def start(self):
+        self._drain()
+
+    def measure(self, label):
+        transferred = 0
+        requests = set()
+        blocked = 0
+        for entry in self._drain():
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                requests.add(params.get('requestId'))
+            elif method == 'Network.loadingFinished':
+                transferred += params.get('encodedDataLength', 0)
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                blocked += 1
+
+        try:
+            dom_ready_ms, load_ms = self.driver.execute_script(NAVIGATION_TIMING_JS)
+        except WebDriverException:
+            dom_ready_ms, load_ms = 0, 0
+
+        page = {
+            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'mode': self.mode,
+            'label': label,
+            'bytes': int(transferred),
+            'requests': len(requests),
+            'blocked': blocked,
+            'dom_ready_ms': round(dom_ready_ms or 0),
+            'load_ms': round(load_ms or 0),
+        }
+        with self._lock:
+            self.pages.append(page)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(page) + '\n')
+        print(f"📦 Page weight ({self.mode}): {page['bytes'] / 1024:.0f} KB in {page['requests']} request(s), "
+              f"{blocked} blocked, loaded in {page['load_ms']} ms")
+        return page
+
+    def summary(self):
+        with self._lock:
+            pages = list(self.pages)
+        if not pages:
+            return {}
+        return {
+            'mode': self.mode,
+            'pages': len(pages),
+            'avg_kb': round(sum(p['bytes'] for p in pages) / len(pages) / 1024, 1),
+            'avg_requests': round(sum(p['requests'] for p in pages) / len(pages), 1),
+            'avg_load_ms': round(sum(p['load_ms'] for p in pages) / len(pages)),
+        }
+
+
+def compare_report(log_path='page_weight.jsonl'):
+    """Prints average page weight per mode from the measurement log."""
+    by_mode = {}
+    try:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                page = json.loads(line)
+                by_mode.setdefault(page['mode'], []).append(page)
+    except FileNotFoundError:
+        print(f"No measurements in {log_path} yet; run with leanBrowser.report: true")
+        return {}
+
+    report = {}
+    for mode, pages in by_mode.items():
+        report[mode] = {
+            'pages': len(pages),
+            'avg_kb': sum(p['bytes'] for p in pages) / len(pages) / 1024,
+            'avg_requests': sum(p['requests'] for p in pages) / len(pages),
+            'avg_load_ms': sum(p['load_ms'] for p in pages) / len(pages),
+        }
+        print(f"  {mode:<5} {report[mode]['pages']:4d} page(s)  {report[mode]['avg_kb']:9.0f} KB/page  "
+              f"{report[mode]['avg_requests']:6.0f} req/page  {report[mode]['avg_load_ms']:7.0f} ms load")
+    if 'full' in report and 'lean' in report and report['full']['avg_kb']:
+        saved = 1 - report['lean']['avg_kb'] / report['full']['avg_kb']
+        print(f"  Lean mode transfers {saved:.0%} fewer bytes per search page")
+    return report
+
+
+if __name__ == '__main__':
+    print("\n📊 Search page weight by browser mode:")
+    compare_report()
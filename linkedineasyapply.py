@@ -11,14 +11,84 @@ If no session exists or it's expired, it calls load_login_page_and_login() to pe
 a fresh login using credentials from config.yaml.
 """
 
-import time, random, os, re, csv
+import os, csv, threading
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium import webdriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from datetime import datetime
-from email_notifier import send_bulk_emails, create_email_template
+from email_notifier import (send_bulk_emails, create_email_template, enqueue_emails, outbox_running,
+                            schedule_followups)
+from contact_ledger import get_contact_index, get_seen_posts
+from post_filter import PostFilter
+from query_planner import get_query_planner
+from lean_browser import lean_settings, PageWeightMeter
+from search_archive import SearchCapture, process_posts, extract_page_source
+import metrics
+from scroll_controller import ScrollController
+from page_waits import pause, wait_for_feed, wait_for_search_results, scroll_and_wait_for_posts
+
+
+# Post containers on the content search results page
+POST_SELECTOR = 'div[data-urn^="urn:li:activity:"], div.feed-shared-update-v2'
+
+# Hands the page the URNs of posts processed for this position in earlier runs
+SEED_KNOWN_POSTS_JS = "window.__jobscannerKnown = new Set(arguments[0]);"
+
+# Returns the text of post nodes rendered since the last call (marking them as
+# extracted, so each scroll only pays for the posts it added) and the page height.
+# Posts already processed for this position in earlier runs are counted but their text is never read.
+# With pruning on (arguments[1]), extracted posts that have scrolled above the
+# viewport are emptied down to a fixed-height shell: the container, its URN and
+# the page height stay, so the scroll position and infinite-scroll trigger are
+# untouched, but their subtrees no longer pile up in the DOM. Also reports the
+# DOM node count and JS heap size so memory can be tracked per scroll.
+EXTRACT_NEW_POSTS_JS = """
+const known = window.__jobscannerKnown || new Set();
+const nodes = Array.from(document.querySelectorAll(arguments[0]));
+const fresh = [];
+let skipped = 0;
+for (const node of nodes) {
+    if (node.dataset.jobscannerSeen) continue;
+    if (node.parentElement && node.parentElement.closest(arguments[0])) continue;
+    node.dataset.jobscannerSeen = '1';
+    if (known.has(node.getAttribute('data-urn'))) {
+        skipped++;
+        continue;
+    }
+    const author = node.querySelector('.update-components-actor__name, .update-components-actor__title');
+    const headline = node.querySelector('.update-components-actor__description');
+    fresh.push({
+        urn: node.getAttribute('data-urn') || '',
+        author: author ? author.innerText : '',
+        headline: headline ? headline.innerText : '',
+        text: node.innerText || ''
+    });
+}
+if (arguments[1]) {
+    for (const node of nodes) {
+        if (!node.dataset.jobscannerSeen || node.dataset.jobscannerPruned) continue;
+        const rect = node.getBoundingClientRect();
+        if (rect.bottom >= 0) continue;
+        node.style.height = rect.height + 'px';
+        node.style.overflow = 'hidden';
+        node.replaceChildren();
+        node.dataset.jobscannerPruned = '1';
+    }
+}
+return {
+    posts: fresh,
+    known: skipped,
+    height: document.body.scrollHeight,
+    dom_nodes: document.getElementsByTagName('*').length,
+    heap: performance.memory ? performance.memory.usedJSHeapSize : 0
+};
+"""
+
+
+# Serializes appends to emails_output.csv when several searches run in parallel
+_csv_lock = threading.Lock()
 
 
 class LinkedinEasyApply:
@@ -34,7 +104,8 @@ class LinkedinEasyApply:
         self.positions = parameters.get('positions', [])
         self.locations = parameters.get('locations', [])
         self.residency = parameters.get('residentStatus', [])
-        self.seen_jobs = []
+        self.seen_jobs = get_seen_posts(self.date_window_days(parameters.get('date', {})))
+        self.pending_post_urns = []
         self.file_name = "output"
         self.unprepared_questions_file_name = "unprepared_questions"
         self.output_file_directory = parameters['outputFileDirectory']
@@ -57,9 +128,34 @@ class LinkedinEasyApply:
         self.date = parameters.get('date', {})
         self.sort_by = parameters.get('sort_by', {})
         self.resume_mapping = parameters.get('resumeMapping', {})
+        self.contact_cooldown_days = parameters.get('contactCooldownDays', 0)
+        self.post_filter = PostFilter(self.company_blacklist, self.title_blacklist, self.poster_blacklist)
+        self.posts_filtered = 0
+        # Saves each search's captured posts for offline replay (see search_archive.py)
+        self.capture = SearchCapture.from_config(parameters)
+        self.recording = None
+        self.rejected_posts = []
+        self.scroll_config = parameters.get('scroll', {}) or {}
+        # Empty extracted posts once scrolled past, so deep scrolls keep DOM size flat
+        self.prune_posts = self.scroll_config.get('prunePosts', False)
+        self.scroll_stats = {}
+        # Random pause added after a page is ready; set waitJitter: [0, 0] to disable
+        self.wait_jitter = tuple(parameters.get('waitJitter', [0.3, 1.0]))
+        self.query_planner = get_query_planner(parameters)
+        browser_settings = lean_settings(parameters)
+        self.page_weight = PageWeightMeter(driver, browser_settings['enabled']) if browser_settings['report'] else None
 
         options = webdriver.ChromeOptions()
 
+    @staticmethod
+    def date_window_days(date):
+        """Days a post stays visible in search results for the configured date filter."""
+        if date.get('24 hours', False):
+            return 1
+        if date.get('week', False):
+            return 7
+        return 30
+
     def login(self):
         """
         Attempts to restore previous LinkedIn session or performs fresh login.
@@ -71,7 +167,8 @@ class LinkedinEasyApply:
             print("Attempting to restore previous session...")
             if os.path.exists("chrome_bot"):
                 self.browser.get("https://www.linkedin.com/feed/")
-                time.sleep(random.uniform(5, 10))
+                wait_for_feed(self.browser, timeout=15)
+                pause(self.wait_jitter)
 
                 # Check if the current URL is the feed page
                 if self.browser.current_url != "https://www.linkedin.com/feed/":
@@ -95,7 +192,8 @@ class LinkedinEasyApply:
 
         if '/checkpoint/challenge/' in current_url or 'security check' in page_source or 'quick verification' in page_source:
             input("Please complete the security check and press enter on this console when it is done.")
-            time.sleep(random.uniform(5.5, 10.5))
+            wait_for_feed(self.browser, timeout=20)
+            pause(self.wait_jitter)
 
     def load_login_page_and_login(self):
         """
@@ -119,16 +217,11 @@ class LinkedinEasyApply:
             EC.url_contains("https://www.linkedin.com/feed/")
         )
 
-        time.sleep(random.uniform(5, 10))
+        wait_for_feed(self.browser, timeout=15)
+        pause(self.wait_jitter)
 
-    def search_posts(self):
-        """
-        Searches for LinkedIn posts using positions/keywords from config.yaml.
-        Iterates through each position, constructs post search URL with date and sort filters,
-        and navigates to filtered post results.
-        """
-        print("\n🔍 Starting post search...")
-        
+    def search_filters(self):
+        """Returns (date_filter, sort_order) URL values from config.yaml."""
         # Determine date filter from config
         date_filter = ""
         if self.date.get('24 hours', False):
@@ -145,111 +238,206 @@ class LinkedinEasyApply:
         elif self.sort_by.get('relevance', False):
             sort_order = "relevance"
         
-        # Iterate through positions from config (used as search keywords)
-        for position in self.positions:
-            print(f"\n📌 Searching posts for: {position}")
-            
-            # Build search URL with filters
-            search_url = f"https://www.linkedin.com/search/results/content/?keywords={position}"
-            
-            # Add date filter if configured
-            if date_filter:
-                search_url += f"&datePosted=%22{date_filter}%22"
-            
-            # Add sort order
-            search_url += f"&sortBy=%22{sort_order}%22"
-            
-            # Add origin parameter
-            search_url += "&origin=FACETED_SEARCH"
-            
-            print(f"🌐 URL: {search_url}")
-            print(f"📅 Date filter: {date_filter if date_filter else 'all time'}")
-            print(f"🔃 Sort by: {sort_order}")
-            
+        return date_filter, sort_order
+
+    @staticmethod
+    def build_search_url(keywords, date_filter, sort_order):
+        """Builds the content search URL for keywords with date and sort filters."""
+        search_url = f"https://www.linkedin.com/search/results/content/?keywords={keywords}"
+        
+        # Add date filter if configured
+        if date_filter:
+            search_url += f"&datePosted=%22{date_filter}%22"
+        
+        # Add sort order
+        search_url += f"&sortBy=%22{sort_order}%22"
+        
+        # Add origin parameter
+        search_url += "&origin=FACETED_SEARCH"
+        
+        return search_url
+
+    def search_posts(self):
+        """
+        Searches for LinkedIn posts using positions x locations from config.yaml.
+        The query planner drops equivalent queries and skips ones that aren't due
+        yet, running the highest-yield queries first.
+        """
+        print("\n🔍 Starting post search...")
+        
+        date_filter, sort_order = self.search_filters()
+        
+        due_queries = self.query_planner.due_queries()
+        skipped = len(self.query_planner.queries) - len(due_queries)
+        print(f"🗂️ {len(due_queries)} search query(ies) due, {skipped} skipped until their next run")
+        
+        for query in due_queries:
+            self.run_query(query, date_filter, sort_order)
+        
+        if self.page_weight and self.page_weight.summary():
+            weight = self.page_weight.summary()
+            print(f"\n📦 {weight['mode'].title()} browser: {weight['avg_kb']} KB and {weight['avg_requests']} request(s) "
+                  f"per search page, {weight['avg_load_ms']} ms average load")
+
+    def run_query(self, query, date_filter=None, sort_order=None):
+        """Runs one planned query and records its yield with the query planner."""
+        result = self.search_position(query.position, date_filter, sort_order, keywords=query.keywords)
+        self.query_planner.record_result(query, result['emails'], result['new_contacts'])
+        self.query_planner.save()
+        return result
+
+    def search_position(self, position, date_filter=None, sort_order=None, keywords=None):
+        """
+        Searches posts for one position: navigates to the results, scrolls while
+        extracting emails from new posts, then logs and emails new contacts.
+        `keywords` overrides the search terms (e.g. position plus location).
+        Returns the position's scroll stats plus emails found and new contacts.
+        """
+        if date_filter is None or sort_order is None:
+            date_filter, sort_order = self.search_filters()
+        keywords = keywords or position
+        
+        print(f"\n📌 Searching posts for: {keywords}")
+        
+        search_url = self.build_search_url(keywords, date_filter, sort_order)
+        
+        print(f"🌐 URL: {search_url}")
+        print(f"📅 Date filter: {date_filter if date_filter else 'all time'}")
+        print(f"🔃 Sort by: {sort_order}")
+        
+        if self.page_weight:
+            self.page_weight.start()
+        self.recording = self.capture.start(position, keywords, search_url) if self.capture else None
+        self.rejected_posts = []
+        self.pending_post_urns = []
+        with metrics.span('navigate'):
             self.browser.get(search_url)
-            time.sleep(random.uniform(3, 5))
-            
-            print(f"✅ Successfully navigated to post search page for '{position}'")
-            
-            # Scroll down to load more content
-            print("\n📜 Scrolling to load more posts...")
-            scroll_pause_time = 2
-            scroll_increments = 15  # Number of times to scroll
-            
-            for i in range(scroll_increments):
-                # Scroll down
-                self.browser.execute_script("window.scrollBy(0, 800);")
-                time.sleep(random.uniform(1.5, 2.5))
-                print(f"  Scrolled {i+1}/{scroll_increments}")
-            
-            print("✅ Finished scrolling, content loaded")
-            
-            # Extract emails from page text
-            print("\n📧 Extracting email addresses from page...")
-            page_text = self.browser.page_source
-            
-            # Regex pattern to find emails (must contain @ and .com)
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.com\b'
-            emails_found = re.findall(email_pattern, page_text)
-            
-            # Remove duplicates
-            unique_emails = list(set(emails_found))
-            
-            print(f"✅ Found {len(unique_emails)} unique email(s)")
-            
-            # Save to output file
-            if unique_emails:
+            if not wait_for_search_results(self.browser, POST_SELECTOR, timeout=15):
+                print("⚠️ Search results did not render in time, continuing anyway")
+            known_posts = self.seen_jobs.known(position)
+            self.browser.execute_script(SEED_KNOWN_POSTS_JS, known_posts)
+        pause(self.wait_jitter)
+        
+        print(f"✅ Successfully navigated to post search page for '{position}' ({len(known_posts)} known post(s) will be skipped)")
+        
+        # Scroll while the feed keeps producing posts and emails, extracting as they render
+        print("\n📜 Scrolling to load more posts...")
+        scroller = ScrollController.from_config(self.scroll_config)
+        found_emails = set()
+        scroller.record_initial(*self.collect_new_post_emails(found_emails))
+        
+        while scroller.should_continue():
+            # Scroll down and wait until new posts render (or the feed is exhausted)
+            with metrics.span('scroll'):
+                scroll_and_wait_for_posts(self.browser, POST_SELECTOR, distance=800, timeout=4)
+            pause(self.wait_jitter)
+            scroller.record(*self.collect_new_post_emails(found_emails))
+            print(f"  Scrolled {scroller.scrolls} - {scroller.posts} post(s), {len(found_emails)} email(s) so far "
+                  f"({scroller.dom_nodes[-1]} DOM nodes, {scroller.heap_bytes[-1] / 1048576:.0f} MB JS heap)")
+        
+        stats = scroller.summary()
+        self.scroll_stats[keywords] = stats
+        if self.page_weight:
+            stats['page_weight'] = self.page_weight.measure(keywords)
+        posts_seen = stats['posts']
+        print(f"✅ Finished scrolling ({stats['stop_reason']}): {stats['scrolls']} scroll(s), "
+              f"{stats['emails_per_scroll']} email(s) per scroll")
+        if stats['dom_nodes']:
+            print(f"🧠 DOM nodes {stats['dom_nodes']['start']} -> {stats['dom_nodes']['end']} "
+                  f"(peak {stats['dom_nodes']['max']}), JS heap {stats['heap_mb']['start']} -> "
+                  f"{stats['heap_mb']['end']} MB (peak {stats['heap_mb']['max']})")
+        
+        # Fall back to the full page source if no post nodes matched the selector
+        if posts_seen == 0:
+            print("\n📧 No post nodes found, extracting email addresses from page source...")
+            page_source = self.browser.page_source
+            if self.recording:
+                self.recording.add_page_source(page_source)
+            with metrics.span('page_source_extract'):
+                extract_page_source(page_source, found_emails)
+        
+        unique_emails = list(found_emails)
+        
+        print(f"✅ Found {len(unique_emails)} unique email(s) in {posts_seen} post(s)")
+        metrics.count('posts_seen', posts_seen)
+        metrics.count('emails_found', len(unique_emails))
+        
+        # Save to output file
+        new_emails_logged = []
+        if unique_emails:
+            with metrics.span('dedupe'):
                 new_emails_logged = self.save_emails_to_file(unique_emails, position)
-                # Generate email template and send emails
-                if new_emails_logged:
+            # Generate email template and send emails
+            if new_emails_logged:
+                with metrics.span('send'):
                     self.send_emails_to_contacts(new_emails_logged, position)
-            else:
-                print("⚠️ No emails found on this page")
-            
-            # Pause after first position for now
+        else:
+            print("⚠️ No emails found on this page")
+        
+        # Remember processed posts only once their emails are logged
+        self.seen_jobs.add(position, self.pending_post_urns)
+        self.pending_post_urns = []
+        
+        if self.recording:
+            self.recording.finish(unique_emails, self.rejected_posts, new_emails_logged)
+            self.recording = None
+        
+        return dict(stats, position=position, keywords=keywords, emails=unique_emails,
+                    emails_found=len(unique_emails), new_contacts=len(new_emails_logged))
+
+    def collect_new_post_emails(self, found_emails):
+        """
+        Pulls the text of post nodes rendered since the last call and adds any
+        email addresses in them to found_emails. Posts processed for this
+        position in earlier runs are skipped in the page, and posts that hit the
+        company, title or poster blacklist are dropped before extraction.
+        Returns (new posts, new emails, page height, DOM node count, JS heap bytes).
+        """
+        with metrics.span('extract_posts_js'):
+            result = self.browser.execute_script(EXTRACT_NEW_POSTS_JS, POST_SELECTOR, self.prune_posts) or {}
+        new_posts = result.get('posts', [])
+        known_posts = result.get('known', 0)
+        if self.recording:
+            self.recording.add_batch(new_posts, known_posts)
+        self.pending_post_urns.extend(post.get('urn', '') for post in new_posts)
+        emails_before = len(found_emails)
+        rejected = process_posts(new_posts, self.post_filter, found_emails)
+        for post, reason in rejected:
+            self.posts_filtered += 1
+            metrics.count('posts_filtered')
+            print(f"  🚫 Skipped post by {post.get('author', '').strip() or 'unknown'} ({reason})")
+        self.rejected_posts.extend(rejected)
+        return (len(new_posts) + known_posts, len(found_emails) - emails_before, result.get('height', 0),
+                result.get('dom_nodes', 0), result.get('heap', 0))
 
     def save_emails_to_file(self, emails, position):
         """
-        Saves extracted emails to CSV file with timestamp and position.
-        Avoids duplicates: same email + same position on same day won't be re-logged.
+        Saves extracted emails to the contact ledger with timestamp and position.
+        Avoids duplicates: addresses are normalized, and the same email + same
+        position on the same day, or any contact inside the contactCooldownDays
+        window, won't be re-logged.
+        New rows are also appended to emails_output.csv for compatibility.
         """
         output_file = "emails_output.csv"
-        file_exists = os.path.isfile(output_file)
         current_time = datetime.now()
-        current_date = current_time.strftime("%Y-%m-%d")
         current_datetime = current_time.strftime("%Y-%m-%d %H:%M:%S")
         
-        # Read existing entries to check for duplicates
-        existing_entries = set()
-        if file_exists:
-            with open(output_file, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                next(reader, None)  # Skip header
-                for row in reader:
-                    if len(row) >= 3:
-                        email = row[0]
-                        pos = row[1]
-                        date_str = row[2].split(' ')[0]  # Extract date only (YYYY-MM-DD)
-                        existing_entries.add((email, pos, date_str))
-        
-        # Filter out duplicates
-        new_emails = []
-        skipped_count = 0
-        for email in emails:
-            entry_key = (email, position, current_date)
-            if entry_key in existing_entries:
-                print(f"  ⏭️  Skipped (already logged today): {email}")
-                skipped_count += 1
-            else:
-                new_emails.append(email)
+        # Dedupe through the resident contact index before touching SMTP
+        contact_index = get_contact_index(self.contact_cooldown_days)
+        new_emails, skipped = contact_index.record(emails, position, current_time)
+        for email, reason in skipped:
+            print(f"  ⏭️  Skipped ({reason}): {email}")
+        skipped_count = len(skipped)
+        metrics.count('duplicates_skipped', skipped_count)
+        metrics.count('new_contacts', len(new_emails))
         
-        # Write only new emails
+        # Append only new emails to the CSV mirror
         if new_emails:
-            with open(output_file, 'a', newline='', encoding='utf-8') as csvfile:
+            with _csv_lock, open(output_file, 'a', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
                 
-                # Write header if file doesn't exist
-                if not file_exists:
+                # Write header if the file is new
+                if csvfile.tell() == 0:
                     writer.writerow(["Email", "Position", "Date/Time"])
                 
                 # Write each new email
@@ -262,7 +450,7 @@ class LinkedinEasyApply:
             print(f"\n⚠️ No new emails to save")
         
         if skipped_count > 0:
-            print(f"⏭️  Skipped {skipped_count} duplicate(s) from today")
+            print(f"⏭️  Skipped {skipped_count} duplicate(s)")
         
         return new_emails  # Return list of new emails that were logged
 
@@ -288,6 +476,12 @@ class LinkedinEasyApply:
         else:
             print(f"⚠️ No resume mapping found for position: {position}")
         
-        # Send emails
+        # Hand off to the background outbox sender if it's running, otherwise send now
+        if outbox_running():
+            enqueue_emails(email_list, position, subject, body, resume_path)
+            return
         print(f"\n📧 Sending emails to {len(email_list)} recipient(s)...")
-        send_bulk_emails(email_list, subject, body, resume_path)
+        # Only contacts that were actually reached get follow-ups, each scheduled as soon
+        # as it is sent so the reply checkers look for its reply from then on
+        send_bulk_emails(email_list, subject, body, resume_path,
+                         on_sent=lambda addr: schedule_followups([addr], position))
@@ -0,0 +1,562 @@
+"""
+LOCAL_SERVERS.PY - Local Mail Server Stand-ins
+===============================================
+Tiny in-process servers that speak just enough of the real protocols to exercise
+email_notifier.py without touching Gmail.
+
+- LocalSMTPServer: accepts EHLO/AUTH/MAIL/RCPT/DATA, stores received messages,
+  counts connections and can drop idle clients to simulate server-side timeouts.
+- LocalIMAPServer: a single INBOX supporting LOGIN/SELECT/SEARCH/FETCH/STORE
+  (plain and UID variants), counting every command so round trips can be measured.
+- LocalSearchPageServer: serves synthetic LinkedIn content-search result pages
+  (same post markup the scraper reads) with a configurable number of posts
+  and share of posts carrying a contact address.
+
+Each server runs on a background thread and binds to 127.0.0.1 on a free port:
+
+    with LocalSMTPServer() as smtp, LocalIMAPServer() as imap:
+        config = smtp.email_config(**imap.email_config_overrides())
+        ...
+"""
+
+import hashlib
+import html
+import http.server
+import random
+import re
+import select
+import socketserver
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Handles one SMTP client connection."""
+
+    def write_line(self, line):
+        self.wfile.write((line + "\r\n").encode('utf-8'))
+        self.wfile.flush()
+
+    def handle(self):
+        server = self.server.owner
+        server._record_connection()
+        if server.idle_timeout:
+            self.connection.settimeout(server.idle_timeout)
+
+        self.write_line("220 localhost ESMTP stand-in")
+        mail_from = None
+        rcpt_to = []
+
+        while True:
+            try:
+                raw = self.rfile.readline()
+            except OSError:
+                # Idle timeout reached - drop the client like a real server would
+                return
+            if not raw:
+                return
+
+            line = raw.decode('utf-8', errors='replace').rstrip("\r\n")
+            command = line.split(' ', 1)[0].upper()
+
+            if command in ('EHLO', 'HELO'):
+                self.wfile.write(b"250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+                self.wfile.flush()
+            elif command == 'AUTH':
+                server._record_login()
+                self.write_line("235 2.7.0 Authentication successful")
+            elif command == 'MAIL':
+                mail_from = line[10:].strip()
+                rcpt_to = []
+                self.write_line("250 OK")
+            elif command == 'RCPT':
+                rcpt_to.append(line[8:].strip().strip('<>'))
+                self.write_line("250 OK")
+            elif command == 'DATA':
+                self.write_line("354 End data with <CR><LF>.<CR><LF>")
+                data_lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    data_lines.append(data_line)
+                server._record_message(mail_from, rcpt_to, b"".join(data_lines))
+                if server.latency:
+                    time.sleep(server.latency)
+                self.write_line("250 OK: queued")
+            elif command == 'RSET':
+                mail_from = None
+                rcpt_to = []
+                self.write_line("250 OK")
+            elif command == 'NOOP':
+                self.write_line("250 OK")
+            elif command == 'QUIT':
+                self.write_line("221 Bye")
+                return
+            else:
+                self.write_line("502 Command not implemented")
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalSMTPServer:
+    """
+    SMTP stand-in for local testing and benchmarks.
+
+    Args:
+        idle_timeout: Seconds of client inactivity before the connection is dropped
+        latency: Artificial delay in seconds added to every accepted message
+    """
+
+    def __init__(self, idle_timeout=None, latency=0.0):
+        self.idle_timeout = idle_timeout
+        self.latency = latency
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def _record_login(self):
+        with self._lock:
+            self.logins += 1
+
+    def _record_message(self, mail_from, rcpt_to, data):
+        with self._lock:
+            self.messages.append({'from': mail_from, 'to': list(rcpt_to), 'data': data})
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def email_config(self, **overrides):
+        """Returns an email_settings dict pointing email_notifier at this server."""
+        config = {
+            'sender_email': 'bot@localhost',
+            'sender_password': 'secret',
+            'smtp_server': '127.0.0.1',
+            'smtp_port': self.port,
+            'smtp_starttls': False,
+        }
+        config.update(overrides)
+        return config
+
+    def start(self):
+        self._server = _ThreadingServer(('127.0.0.1', 0), _SMTPHandler)
+        self._server.owner = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+_MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def _parse_imap_date(value):
+    day, month, year = value.split('-')
+    return (int(year), _MONTHS.index(month.capitalize()) + 1, int(day))
+
+
+def _in_sequence_set(number, sequence_set, highest):
+    for chunk in sequence_set.split(','):
+        if ':' in chunk:
+            low, high = chunk.split(':')
+            low = highest if low == '*' else int(low)
+            high = highest if high == '*' else int(high)
+            if min(low, high) <= number <= max(low, high):
+                return True
+        elif (highest if chunk == '*' else int(chunk)) == number:
+            return True
+    return False
+
+
+class _IMAPHandler(socketserver.StreamRequestHandler):
+    """Handles one IMAP client connection against the shared mailbox."""
+
+    def write_line(self, line):
+        self.wfile.write((line + "\r\n").encode('utf-8'))
+        self.wfile.flush()
+
+    def handle(self):
+        server = self.server.owner
+        server._record_connection()
+        self.write_line("* OK IMAP4rev1 stand-in ready")
+
+        while True:
+            try:
+                raw = self.rfile.readline()
+            except OSError:
+                return
+            if not raw:
+                return
+
+            line = raw.decode('utf-8', errors='replace').rstrip("\r\n")
+            parts = line.split(' ', 2)
+            if len(parts) < 2:
+                continue
+            tag, command = parts[0], parts[1].upper()
+            args = parts[2] if len(parts) > 2 else ''
+            server._record_command(command)
+
+            use_uid = False
+            if command == 'UID':
+                use_uid = True
+                command, _, args = args.partition(' ')
+                command = command.upper()
+
+            if command == 'CAPABILITY':
+                self.write_line("* CAPABILITY IMAP4rev1 IDLE")
+            elif command == 'LOGIN':
+                pass
+            elif command in ('SELECT', 'EXAMINE'):
+                with server._lock:
+                    count = len(server.mailbox)
+                    uid_next = server.next_uid
+                    uid_validity = server.uid_validity
+                self.write_line(f"* {count} EXISTS")
+                self.write_line("* 0 RECENT")
+                self.write_line(f"* OK [UIDVALIDITY {uid_validity}] UIDs valid")
+                self.write_line(f"* OK [UIDNEXT {uid_next}] Predicted next UID")
+                self.write_line(f"{tag} OK [READ-WRITE] SELECT completed")
+                continue
+            elif command == 'SEARCH':
+                matches = self.search(server, args, use_uid)
+                self.write_line("* SEARCH" + ''.join(f" {n}" for n in matches))
+            elif command == 'FETCH':
+                self.fetch(server, args, use_uid)
+            elif command == 'STORE':
+                self.store(server, args, use_uid)
+            elif command == 'IDLE':
+                self.idle(server)
+            elif command == 'LOGOUT':
+                self.write_line("* BYE logging out")
+                self.write_line(f"{tag} OK LOGOUT completed")
+                return
+            elif command not in ('NOOP', 'CLOSE', 'CHECK', 'EXPUNGE'):
+                self.write_line(f"{tag} BAD unknown command")
+                continue
+            self.write_line(f"{tag} OK {command} completed")
+
+    def selected(self, server, sequence_set, use_uid):
+        """Returns [(seq, message)] for the sequence or UID set."""
+        with server._lock:
+            mailbox = list(server.mailbox)
+        if not mailbox:
+            return []
+        highest = mailbox[-1]['uid'] if use_uid else len(mailbox)
+        result = []
+        for seq, message in enumerate(mailbox, start=1):
+            number = message['uid'] if use_uid else seq
+            if _in_sequence_set(number, sequence_set, highest):
+                result.append((seq, message))
+        return result
+
+    def search(self, server, args, use_uid):
+        tokens = re.findall(r'"[^"]*"|\S+', args)
+        with server._lock:
+            mailbox = list(server.mailbox)
+        highest_uid = mailbox[-1]['uid'] if mailbox else 0
+
+        matches = []
+        for seq, message in enumerate(mailbox, start=1):
+            ok = True
+            i = 0
+            while i < len(tokens):
+                key = tokens[i].upper()
+                if key == 'ALL':
+                    i += 1
+                elif key == 'SINCE':
+                    ok = ok and message['date'] >= _parse_imap_date(tokens[i + 1].strip('"'))
+                    i += 2
+                elif key == 'FROM':
+                    ok = ok and tokens[i + 1].strip('"').lower() in message['from'].lower()
+                    i += 2
+                elif key == 'UID':
+                    ok = ok and _in_sequence_set(message['uid'], tokens[i + 1], highest_uid)
+                    i += 2
+                else:
+                    i += 1
+            if ok:
+                matches.append(message['uid'] if use_uid else seq)
+        return matches
+
+    def fetch(self, server, args, use_uid):
+        sequence_set, _, items = args.partition(' ')
+        want_header = 'HEADER.FIELDS' in items.upper()
+        for seq, message in self.selected(server, sequence_set, use_uid):
+            if want_header:
+                header = f"From: {message['from']}\r\n\r\n".encode('utf-8')
+                self.wfile.write(
+                    f"* {seq} FETCH (UID {message['uid']} BODY[HEADER.FIELDS (FROM)] {{{len(header)}}}\r\n".encode('utf-8')
+                    + header + b")\r\n"
+                )
+            else:
+                flags = ' '.join(sorted(message['flags']))
+                self.wfile.write(f"* {seq} FETCH (UID {message['uid']} FLAGS ({flags}))\r\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def store(self, server, args, use_uid):
+        sequence_set, _, rest = args.partition(' ')
+        mode, _, flags = rest.partition(' ')
+        flags = set(flags.strip('()').split())
+        for seq, message in self.selected(server, sequence_set, use_uid):
+            with server._lock:
+                if mode.upper().startswith('+'):
+                    message['flags'] |= flags
+                elif mode.upper().startswith('-'):
+                    message['flags'] -= flags
+                else:
+                    message['flags'] = set(flags)
+
+    def idle(self, server):
+        self.write_line("+ idling")
+        with server._lock:
+            seen = len(server.mailbox)
+        while True:
+            with server._lock:
+                count = len(server.mailbox)
+            if count != seen:
+                self.write_line(f"* {count} EXISTS")
+                seen = count
+            readable, _, _ = select.select([self.connection], [], [], 0.05)
+            if readable:
+                raw = self.rfile.readline()
+                if not raw or raw.strip().upper() == b'DONE':
+                    return
+
+
+class LocalIMAPServer:
+    """
+    IMAP stand-in with a single INBOX.
+
+    Messages are added with deliver(); `commands` counts every command the
+    clients issued, which is the number of round trips they paid for.
+    """
+
+    def __init__(self, uid_validity=1):
+        self.uid_validity = uid_validity
+        self.next_uid = 1
+        self.mailbox = []
+        self.connections = 0
+        self.commands = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def _record_command(self, command):
+        with self._lock:
+            self.commands[command] = self.commands.get(command, 0) + 1
+
+    @property
+    def round_trips(self):
+        with self._lock:
+            return sum(self.commands.values())
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def deliver(self, from_addr, date=None):
+        """Appends a message from from_addr. date is a (year, month, day) tuple."""
+        if date is None:
+            date = time.localtime()[:3]
+        with self._lock:
+            uid = self.next_uid
+            self.next_uid += 1
+            self.mailbox.append({'uid': uid, 'from': from_addr, 'date': tuple(date), 'flags': set()})
+        return uid
+
+    def reset_uid_validity(self, uid_validity):
+        """Simulates the server renumbering the mailbox."""
+        with self._lock:
+            self.uid_validity = uid_validity
+
+    def flagged(self):
+        with self._lock:
+            return [m['from'] for m in self.mailbox if '\\Flagged' in m['flags']]
+
+    def email_config_overrides(self):
+        """Returns the email_settings keys that point the reply checker here."""
+        return {'imap_server': '127.0.0.1', 'imap_port': self.port, 'imap_ssl': False}
+
+    def start(self):
+        self._server = _ThreadingServer(('127.0.0.1', 0), _IMAPHandler)
+        self._server.owner = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+_POST_WORDS = ["hiring", "c2c", "java", "developer", "remote", "contract", "w2", "urgent", "requirement",
+               "client", "please", "share", "resume", "visa", "onsite", "python", "data", "engineer",
+               "months", "rate", "hybrid", "immediate", "interview", "lead", "senior"]
+_POST_TLDS = ["com", "io", "net", "co.uk", "us", "tech"]
+
+
+def synthetic_posts(keywords, page, posts_per_page, email_density, seed=0):
+    """
+    Deterministic synthetic search results: [{urn, author, headline, text}].
+    The same (keywords, page, seed) always yields the same posts.
+    """
+    digest = hashlib.sha1(f"{seed}|{keywords}|{page}".encode('utf-8')).hexdigest()
+    rng = random.Random(int(digest[:16], 16))
+    posts = []
+    for index in range(posts_per_page):
+        words = rng.choices(_POST_WORDS, k=rng.randint(40, 120))
+        text = f"{keywords} " + ' '.join(words)
+        if rng.random() < email_density:
+            user = ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(4, 10)))
+            domain = ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(4, 9)))
+            tld = rng.choice(_POST_TLDS)
+            style = rng.random()
+            if style < 0.1:
+                address = f"{user} [at] {domain} [dot] {tld.replace('.', ' [dot] ')}"
+            else:
+                address = f"{user}@{domain}.{tld}"
+            text += f" send resumes to {address}."
+        posts.append({
+            'urn': f"urn:li:activity:{int(digest[:12], 16)}{index:04d}",
+            'author': f"{rng.choice(['Alex', 'Sam', 'Priya', 'Chen', 'Maria', 'Omar'])} "
+                      f"{rng.choice(['Smith', 'Rao', 'Garcia', 'Lee', 'Khan', 'Brown'])}",
+            'headline': f"Technical Recruiter at {rng.choice(['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli'])}",
+            'text': text,
+        })
+    return posts
+
+
+def render_search_page(posts):
+    """Renders posts in the content search markup the scraper's selectors expect."""
+    items = []
+    for post in posts:
+        items.append(
+            f'<div class="feed-shared-update-v2" data-urn="{post["urn"]}">'
+            f'<div class="update-components-actor"><span class="update-components-actor__name">'
+            f'{html.escape(post["author"])}</span><span class="update-components-actor__description">'
+            f'{html.escape(post["headline"])}</span></div>'
+            f'<img src="https://media.licdn.com/dms/image/logo@2x.png">'
+            f'<div class="update-components-text"><span dir="ltr" class="break-words">'
+            f'{html.escape(post["text"])}</span></div></div>'
+        )
+    return ('<!DOCTYPE html><html><head><title>Search | LinkedIn</title></head><body>'
+            '<main class="scaffold-layout__main"><div class="search-results-container">'
+            + '\n'.join(items) + '</div></main></body></html>')
+
+
+class _SearchPageHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server.owner
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') != '/search/results/content':
+            self.send_error(404)
+            return
+        query = parse_qs(url.query)
+        keywords = query.get('keywords', [''])[0]
+        page = int(query.get('page', ['1'])[0])
+        posts = synthetic_posts(keywords, page, server.posts_per_page, server.email_density, server.seed)
+        body = render_search_page(posts).encode('utf-8')
+        if server.latency:
+            time.sleep(server.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        server._record_request(len(body))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalSearchPageServer:
+    """
+    HTTP stand-in for LinkedIn content search.
+
+    GET /search/results/content/?keywords=...&page=N returns `posts_per_page`
+    synthetic posts; `email_density` is the share of posts with an address.
+
+    Args:
+        posts_per_page: Posts rendered per page
+        email_density: Probability (0-1) that a post includes a contact address
+        seed: Varies the generated content between corpora
+        latency: Artificial delay in seconds per page
+    """
+
+    def __init__(self, posts_per_page=25, email_density=0.3, seed=0, latency=0.0):
+        self.posts_per_page = posts_per_page
+        self.email_density = email_density
+        self.seed = seed
+        self.latency = latency
+        self.requests = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _record_request(self, size):
+        with self._lock:
+            self.requests += 1
+            self.bytes_served += size
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def search_url(self, keywords, page=1):
+        return f"http://127.0.0.1:{self.port}/search/results/content/?keywords={keywords}&page={page}"
+
+    def start(self):
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _SearchPageHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
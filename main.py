@@ -19,16 +19,49 @@ Key Features:
 - Continuous monitoring and application submission
 """
 
-import yaml, os, time, inspect
+import yaml, os, sys, time, inspect
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from datetime import datetime
 from validate_email import validate_email
 from webdriver_manager.chrome import ChromeDriverManager
 from linkedineasyapply import LinkedinEasyApply
-from email_notifier import check_email_replies, send_followup_emails
-def init_browser():
+from parallel_search import run_parallel_search
+from lean_browser import lean_settings, apply_browser_options, enable_request_blocking
+import metrics
+from email_notifier import (check_email_replies, plan_followups, send_planned_followups,
+                            load_email_config, start_reply_watcher, start_outbox_sender)
+
+# Where the last resolved chromedriver path is remembered between runs
+DRIVER_PATH_CACHE = '.chromedriver_path'
+_driver_path = None
+
+
+def resolve_driver_path(refresh=False):
+    """
+    Returns the chromedriver path, asking ChromeDriverManager (which checks
+    the network) only when there is no cached path or refresh is requested.
+    """
+    global _driver_path
+    if not refresh:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+        if os.path.exists(DRIVER_PATH_CACHE):
+            with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+                cached = f.read().strip()
+            if cached and os.path.exists(cached):
+                _driver_path = cached
+                return _driver_path
+    _driver_path = ChromeDriverManager().install()
+    with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+        f.write(_driver_path)
+    return _driver_path
+
+
+def init_browser(user_data_dir=None, debugging_port=9222, lean=None):
+    lean = lean or {}
     browser_options = Options()
     options = [
         '--disable-blink-features',
@@ -37,19 +70,29 @@ def init_browser():
         '--disable-extensions',
         '--ignore-certificate-errors',
         '--disable-blink-features=AutomationControlled',
-        '--remote-debugging-port=9222'
+        f'--remote-debugging-port={debugging_port}'
     ]
 
     # Restore session if possible (avoids login everytime)
-    user_data_dir = os.path.join(os.getcwd(), "chrome_bot")
+    user_data_dir = user_data_dir or os.path.join(os.getcwd(), "chrome_bot")
     browser_options.add_argument(f"user-data-dir={user_data_dir}")
 
     for option in options:
         browser_options.add_argument(option)
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=browser_options)
-    driver.implicitly_wait(1)  # Wait time in seconds to allow loading of elements
+    # Lean scraping mode: skip images/media/fonts/trackers, optionally headless
+    apply_browser_options(browser_options, lean)
+
+    try:
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=browser_options)
+    except SessionNotCreatedException:
+        # Cached driver no longer matches the installed Chrome: resolve it again
+        print("⚠️ Cached chromedriver doesn't match Chrome, resolving a new one")
+        driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=browser_options)
+    blocked_patterns = enable_request_blocking(driver, lean)
+    if blocked_patterns:
+        print(f"🪶 Lean browser mode: blocking {blocked_patterns} URL pattern(s)")
+    # No implicit wait: page readiness is handled by explicit waits in page_waits.py
     driver.set_window_position(0, 0)
     driver.maximize_window()
     return driver
@@ -168,56 +211,88 @@ def space_before_next():
     time.sleep(300)  # Wait 5 minutes
 
 if __name__ == '__main__':
+    if '--daemon' in sys.argv[1:]:
+        # Long-running mode: one warm browser, periodic jobs, per-component recovery
+        from daemon import run_daemon
+        parameters = validate_yaml()
+        metrics.configure(parameters)
+        browser_settings = lean_settings(parameters)
+        try:
+            run_daemon(
+                parameters,
+                browser_factory=lambda: init_browser(lean=browser_settings),
+                worker_browser_factory=lambda index, profile: init_browser(profile, debugging_port=9223 + index,
+                                                                           lean=browser_settings),
+            )
+        except KeyboardInterrupt:
+            print("\n\n⛔ Daemon stopped by user.")
+        sys.exit(0)
+
     while True:  # Run indefinitely, restart on any error
         try:
             parameters = validate_yaml()
+            metrics.configure(parameters)
             
-            # Check for replies to emails sent in last 3 hours
+            # Check for replies from everyone who may still get a follow-up
+            email_config = load_email_config() or {}
             print("\n" + "="*60)
             print("CHECKING EMAIL REPLIES")
             print("="*60)
-            reply_status = check_email_replies(hours=3)
+            reply_status = None
+            with metrics.span('reply_check'):
+                try:
+                    reply_status = check_email_replies(raise_errors=True)
+                except Exception as e:
+                    print(f"❌ Error checking emails: {e}")
             
-            # Send follow-up emails to those who didn't reply
-            if reply_status['no_reply']:
-                print("\n📤 Sending follow-up emails...")
-                # Group by position from CSV
-                import csv
-                from datetime import datetime, timedelta
-                
-                no_reply_by_position = {}
-                cutoff_time = datetime.now() - timedelta(hours=3)
-                
-                if os.path.exists('emails_output.csv'):
-                    with open('emails_output.csv', 'r', encoding='utf-8') as f:
-                        reader = csv.reader(f)
-                        next(reader, None)
-                        for row in reader:
-                            if len(row) >= 3:
-                                email_addr = row[0].lower()
-                                position = row[1]
-                                sent_time = datetime.strptime(row[2], '%Y-%m-%d %H:%M:%S')
-                                
-                                if email_addr in reply_status['no_reply'] and sent_time >= cutoff_time:
-                                    if position not in no_reply_by_position:
-                                        no_reply_by_position[position] = []
-                                    no_reply_by_position[position].append(email_addr)
-                
-                # Send follow-ups grouped by position
-                for position, emails in no_reply_by_position.items():
-                    print(f"\n📋 Position: {position}")
-                    send_followup_emails(emails, position, parameters['personalInfo'])
+            # Send the follow-ups that are due to those who didn't reply; without a
+            # successful reply check there is no telling who replied, so skip them
+            if reply_status is None:
+                print("⏭️  Skipping follow-ups until replies can be checked")
+            else:
+                with metrics.span('followups'):
+                    followup_plan = plan_followups(reply_status)
+                    if followup_plan:
+                        print("\n📤 Sending follow-up emails...")
+                        send_planned_followups(followup_plan, parameters['personalInfo'])
+            
+            # Optionally keep watching for replies (IMAP IDLE) while the scraper runs;
+            # after a restart the watcher from the failed attempt is reused
+            reply_watcher = None
+            if email_config.get('watch_replies', False):
+                reply_watcher = start_reply_watcher(email_config)
+            
+            # Optionally send from the durable outbox in the background while the scraper runs
+            outbox_sender = None
+            if email_config.get('use_outbox', False):
+                outbox_sender = start_outbox_sender(email_config)
             
             print("\n" + "="*60)
             print("STARTING JOB SEARCH")
             print("="*60)
             
-            browser = init_browser()
+            browser_settings = lean_settings(parameters)
+            with metrics.span('init_browser'):
+                browser = init_browser(lean=browser_settings)
 
             bot = LinkedinEasyApply(parameters, browser)
-            bot.login()
-            bot.security_check()
-            bot.search_posts()  # Search for posts using keywords from positions list
+            with metrics.span('login'):
+                bot.login()
+                bot.security_check()
+            
+            parallel_workers = (parameters.get('parallelSearch', {}) or {}).get('workers', 1)
+            if parallel_workers > 1:
+                # Close the main browser so its logged-in profile can be copied to the workers
+                browser.quit()
+                run_parallel_search(
+                    parameters,
+                    browser_factory=lambda index, profile: init_browser(profile, debugging_port=9223 + index,
+                                                                   lean=browser_settings),
+                    bot_factory=LinkedinEasyApply,
+                )
+            else:
+                with metrics.span('search'):
+                    bot.search_posts()  # Search for posts using keywords from positions list
             
             current_line = inspect.currentframe().f_lineno
             print("\n✅ Job search completed successfully!")
@@ -225,7 +300,13 @@ if __name__ == '__main__':
             print("Program finished. Exiting...")
             
             # Close browser and exit
-            browser.quit()
+            if parallel_workers <= 1:
+                browser.quit()
+            if reply_watcher:
+                reply_watcher.stop()
+            if outbox_sender:
+                outbox_sender.stop(drain=True)
+            metrics.write_report(outcome='completed')
             break  # Exit the outer while loop
                 
         except KeyboardInterrupt:
@@ -233,5 +314,7 @@ if __name__ == '__main__':
             break
         except Exception as e:
             print(f"\n\n❌ Error occurred: {e}")
+            metrics.count('restarts')
+            metrics.write_report(outcome='error', error=str(e))
             print("Restarting...\n")
             space_before_next()
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+METRICS.PY - Stage Timing and Counters
+=======================================
+Lightweight instrumentation for one bot cycle: where the time went
+(browser start, login, navigation, scrolling, extraction, dedupe, SMTP, IMAP)
+and what came out of it (emails found, duplicates skipped, sends, IMAP round
+trips).
+
+    with metrics.span('login'):
+        bot.login()
+    metrics.count('emails_found', len(emails))
+    metrics.observe('smtp_send_seconds', elapsed)
+
+Metrics are off unless enabled; while off, span() returns a shared no-op
+context manager and count()/observe() return right away, so instrumented
+code costs one global lookup per call.
+
+write_report() appends one JSON line per run to metrics.jsonl and rewrites
+metrics.prom in Prometheus text format (for node_exporter's textfile
+collector). Enable in config.yaml:
+
+    metrics:
+      enabled: true
+      jsonPath: metrics.jsonl
+      prometheusPath: metrics.prom
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+PROMETHEUS_PREFIX = 'jobscanner'
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.add_sample(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and timing/latency samples for one run."""
+
+    def __init__(self, json_path='metrics.jsonl', prometheus_path='metrics.prom'):
+        self.json_path = json_path
+        self.prometheus_path = prometheus_path
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.samples = {}
+
+    def add_sample(self, name, value):
+        with self._lock:
+            self.samples.setdefault(name, []).append(value)
+
+    def add_count(self, name, value):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.samples = {}
+            self.started_at = datetime.now()
+
+    def snapshot(self):
+        """Returns counters and per-sample summaries (count, total, quantiles, max)."""
+        with self._lock:
+            counters = dict(self.counters)
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+        summaries = {}
+        for name, values in samples.items():
+            summary = {'count': len(values), 'sum': round(sum(values), 6), 'max': round(values[-1], 6)}
+            for q in QUANTILES:
+                summary[f'p{int(q * 100)}'] = round(_quantile(values, q), 6)
+            summaries[name] = summary
+        return {'counters': counters, 'timings': summaries}
+
+    def write_report(self, **run_info):
+        """Appends this run to the JSON lines log and rewrites the Prometheus file."""
+        snapshot = self.snapshot()
+        record = dict(run_info, started_at=self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+                      finished_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'), **snapshot)
+        with open(self.json_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+        tmp_path = self.prometheus_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(_prometheus_text(snapshot))
+        os.replace(tmp_path, self.prometheus_path)
+        return record
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _metric_name(name):
+    return f"{PROMETHEUS_PREFIX}_" + ''.join(c if c.isalnum() else '_' for c in name)
+
+
+def _prometheus_text(snapshot):
+    lines = []
+    for name, value in sorted(snapshot['counters'].items()):
+        metric = _metric_name(name) + '_total'
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    for name, summary in sorted(snapshot['timings'].items()):
+        metric = _metric_name(name)
+        if not metric.endswith('_seconds'):
+            metric += '_seconds'
+        lines.append(f"# TYPE {metric} summary")
+        for q in QUANTILES:
+            lines.append(f'{metric}{{quantile="{q}"}} {summary[f"p{int(q * 100)}"]}')
+        lines.append(f"{metric}_sum {summary['sum']}")
+        lines.append(f"{metric}_count {summary['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+_registry = None
+
+
+def enable(json_path='metrics.jsonl', prometheus_path='metrics.prom'):
+    """Turns metrics on for this process (idempotent). Returns the registry."""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry(json_path, prometheus_path)
+    return _registry
+
+
+def configure(parameters):
+    """Enables metrics if config.yaml has metrics.enabled."""
+    settings = parameters.get('metrics', {}) or {}
+    if settings.get('enabled', False):
+        return enable(settings.get('jsonPath', 'metrics.jsonl'), settings.get('prometheusPath', 'metrics.prom'))
+    return None
+
+
+def enabled():
+    return _registry is not None
+
+
+def span(name):
+    """Context manager that times a stage under `name` (a no-op while disabled)."""
+    registry = _registry
+    if registry is None:
+        return _NULL_SPAN
+    return _Span(registry, name)
+
+
+def count(name, value=1):
+    registry = _registry
+    if registry is not None:
+        registry.add_count(name, value)
+
+
+def observe(name, value):
+    """Records one latency (seconds) or size sample."""
+    registry = _registry
+    if registry is not None:
+        registry.add_sample(name, value)
+
+
+def write_report(**run_info):
+    """Writes the run report and starts a fresh run. Returns the record, or None while disabled."""
+    registry = _registry
+    if registry is None:
+        return None
+    record = registry.write_report(**run_info)
+    registry.reset()
+    print(f"📈 Metrics written to {registry.json_path} and {registry.prometheus_path}")
+    return record
+
+
+if __name__ == '__main__':
+    # Cost of instrumentation when disabled vs enabled
+    iterations = 1_000_000
+    for label in ('disabled', 'enabled'):
+        if label == 'enabled':
+            enable(os.devnull, os.devnull)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            with span('noop'):
+                pass
+            count('noop')
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<8} {elapsed / iterations * 1e9:7.0f} ns per span + count")
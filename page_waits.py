@@ -0,0 +1,106 @@
+"""
+PAGE_WAITS.PY - Condition-Based Waits
+======================================
+Wait helpers built on WebDriverWait so the bot moves on as soon as LinkedIn is
+ready instead of sleeping a fixed random 3-10 seconds.
+
+Each wait returns True once its condition holds, or False on timeout (callers
+decide whether that is fatal). pause() adds a short random jitter on top of
+readiness, never in place of it, so the bot still doesn't act with
+machine-perfect timing.
+"""
+
+import random
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+
+FEED_URL = "https://www.linkedin.com/feed/"
+
+# Elements that only exist once the feed has rendered
+FEED_READY_SELECTOR = 'div.feed-shared-update-v2, div.scaffold-finite-scroll, main.scaffold-layout__main'
+
+# Search page states that mean "results are in": posts, or an empty-results banner
+SEARCH_EMPTY_SELECTOR = 'div.search-reusable-search-no-results, section.artdeco-empty-state'
+
+COUNT_AND_HEIGHT_JS = "return [document.querySelectorAll(arguments[0]).length, document.body.scrollHeight];"
+
+# Measures the baseline, then scrolls, in a single round trip
+SCROLL_AND_MEASURE_JS = """
+const baseline = [document.querySelectorAll(arguments[0]).length, document.body.scrollHeight];
+window.scrollBy(0, arguments[1]);
+return baseline;
+"""
+
+
+def pause(jitter=(0.3, 1.0)):
+    """Sleeps a random time in the jitter range. A falsy jitter skips the pause."""
+    if jitter:
+        time.sleep(random.uniform(*jitter))
+
+
+def _wait(driver, condition, timeout, poll_frequency=0.25):
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+        return True
+    except TimeoutException:
+        return False
+
+
+class document_ready:
+    """Expected condition: the document finished loading."""
+
+    def __call__(self, driver):
+        return driver.execute_script("return document.readyState") == "complete"
+
+
+class new_posts_rendered:
+    """
+    Expected condition: more nodes match `selector`, or the page grew taller,
+    than the given baseline.
+    """
+
+    def __init__(self, selector, previous_count, previous_height):
+        self.selector = selector
+        self.previous_count = previous_count
+        self.previous_height = previous_height
+
+    def __call__(self, driver):
+        try:
+            count, height = driver.execute_script(COUNT_AND_HEIGHT_JS, self.selector)
+        except WebDriverException:
+            return False
+        return count > self.previous_count or height > self.previous_height
+
+
+def wait_for_feed(driver, timeout=15):
+    """Waits until the LinkedIn feed has loaded."""
+    return _wait(driver, EC.all_of(
+        EC.url_contains(FEED_URL),
+        EC.presence_of_element_located((By.CSS_SELECTOR, FEED_READY_SELECTOR)),
+    ), timeout)
+
+
+def wait_for_search_results(driver, post_selector, timeout=15):
+    """Waits until the content search page shows posts or an empty-results banner."""
+    return _wait(driver, EC.all_of(
+        document_ready(),
+        EC.any_of(
+            EC.presence_of_element_located((By.CSS_SELECTOR, post_selector)),
+            EC.presence_of_element_located((By.CSS_SELECTOR, SEARCH_EMPTY_SELECTOR)),
+        ),
+    ), timeout)
+
+
+def scroll_and_wait_for_posts(driver, post_selector, distance=800, timeout=4):
+    """
+    Scrolls by `distance` pixels, then waits for more posts or a taller page
+    than before the scroll. Returns False if nothing new rendered in time.
+    """
+    try:
+        count, height = driver.execute_script(SCROLL_AND_MEASURE_JS, post_selector, distance)
+    except WebDriverException:
+        return False
+    return _wait(driver, new_posts_rendered(post_selector, count, height), timeout)
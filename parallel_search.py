@@ -0,0 +1,152 @@
+"""
+PARALLEL_SEARCH.PY - Multi-Browser Post Search
+===============================================
+Runs the planned search queries (see query_planner.py) across a small pool of
+Chrome workers instead of one query at a time in a single browser.
+
+Each worker gets its own copy of the logged-in chrome_bot profile (Chrome
+won't share a profile directory between processes), its own debugging port
+and its own LinkedinEasyApply instance. Queries are handed out from a shared
+queue. Contacts found by every worker go through the same process-wide dedupe
+index, ledger and rate-limited sender, all of which are thread-safe.
+
+To stay polite, page navigations across all workers are spaced at least
+`minNavigationInterval` seconds apart. Configure in config.yaml:
+
+    parallelSearch:
+      workers: 3
+      minNavigationInterval: 5
+"""
+
+import os
+import queue
+import shutil
+import threading
+import time
+
+from query_planner import SearchQuery, get_query_planner
+
+# Chrome lock files that must not be copied into a worker profile
+_PROFILE_LOCKS = ('SingletonLock', 'SingletonCookie', 'SingletonSocket', 'lockfile')
+
+
+class NavigationGate:
+    """Spaces navigations from all workers at least `interval` seconds apart."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = max(self._next_allowed - now, 0.0)
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        if delay:
+            time.sleep(delay)
+
+
+def prepare_worker_profile(source_dir, worker_dir):
+    """Copies the logged-in browser profile for a worker, skipping Chrome lock files."""
+    if os.path.exists(worker_dir):
+        shutil.rmtree(worker_dir, ignore_errors=True)
+    if os.path.exists(source_dir):
+        shutil.copytree(source_dir, worker_dir, ignore=shutil.ignore_patterns(*_PROFILE_LOCKS),
+                        ignore_dangling_symlinks=True)
+    else:
+        os.makedirs(worker_dir, exist_ok=True)
+    return worker_dir
+
+
+class _GatedBrowser:
+    """Wraps a WebDriver so every get() waits on the shared NavigationGate."""
+
+    def __init__(self, driver, gate):
+        self._driver = driver
+        self._gate = gate
+
+    def get(self, url):
+        self._gate.wait()
+        return self._driver.get(url)
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+def run_parallel_search(parameters, browser_factory, bot_factory, positions=None,
+                        profile_dir='chrome_bot', workers_dir='chrome_bot_workers'):
+    """
+    Searches positions with a pool of browser workers.
+
+    Args:
+        parameters: Validated config.yaml parameters
+        browser_factory: callable(worker_index, profile_dir) -> WebDriver
+        bot_factory: callable(parameters, driver) -> LinkedinEasyApply
+        positions: Positions to search, bypassing the query planner (defaults to
+            the planner's due queries)
+        profile_dir: Logged-in profile to copy for each worker
+        workers_dir: Directory that holds the per-worker profile copies
+
+    Returns:
+        dict: {query keywords: search_position() result, or {'error': message}}
+    """
+    settings = parameters.get('parallelSearch', {}) or {}
+    if positions is not None:
+        queries = [SearchQuery(position) for position in positions]
+    else:
+        queries = get_query_planner(parameters).due_queries()
+    worker_count = max(1, min(int(settings.get('workers', 2)), len(queries) or 1))
+    gate = NavigationGate(float(settings.get('minNavigationInterval', 5)))
+
+    pending = queue.Queue()
+    for query in queries:
+        pending.put(query)
+
+    results = {}
+    results_lock = threading.Lock()
+
+    def worker(index):
+        worker_profile = prepare_worker_profile(profile_dir, os.path.join(workers_dir, f"worker_{index}"))
+        driver = None
+        try:
+            driver = browser_factory(index, os.path.abspath(worker_profile))
+            bot = bot_factory(parameters, _GatedBrowser(driver, gate))
+            bot.login()
+            bot.security_check()
+            date_filter, sort_order = bot.search_filters()
+            while True:
+                try:
+                    query = pending.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    result = bot.run_query(query, date_filter, sort_order)
+                except Exception as e:
+                    print(f"❌ Worker {index} failed on '{query.keywords}': {e}")
+                    result = {'error': str(e)}
+                with results_lock:
+                    results[query.keywords] = result
+        except Exception as e:
+            print(f"❌ Worker {index} could not start: {e}")
+        finally:
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    print(f"\n🧵 Searching {len(queries)} query(ies) with {worker_count} browser worker(s)...")
+    threads = [threading.Thread(target=worker, args=(i,), name=f"search-worker-{i}", daemon=True)
+               for i in range(worker_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Queries left behind by workers that failed to start
+    while not pending.empty():
+        query = pending.get_nowait()
+        results[query.keywords] = {'error': 'no worker available'}
+
+    return results
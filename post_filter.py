@@ -0,0 +1,193 @@
+"""
+POST_FILTER.PY - Blacklist Filtering for Search Results
+========================================================
+Drops posts we don't want to answer before their emails reach the sender.
+
+All blacklist terms from config.yaml go into one Aho-Corasick automaton, so
+checking a post costs a single pass over its text no matter how many terms
+there are:
+- posterBlacklist  -> matched against the post author's name
+- companyBlacklist -> matched against the author's headline and the post text
+- titleBlacklist   -> matched against the post text
+
+Matching is case-insensitive and on word boundaries ("IT" won't hit "with").
+
+Run this file directly to benchmark matching speed with thousands of terms:
+
+    python post_filter.py --terms 5000
+"""
+
+import random
+import re
+import string
+import time
+from collections import deque
+
+AUTHOR = 'author'
+HEADLINE = 'headline'
+TEXT = 'text'
+
+# Which post fields each blacklist applies to
+BLACKLIST_FIELDS = {
+    'poster': (AUTHOR,),
+    'company': (HEADLINE, TEXT),
+    'title': (TEXT,),
+}
+
+_FIELD_SEPARATOR = '\x00'
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher over lowercase text.
+
+    add() every term with a payload, then build() once; find_all() yields
+    (end index, term, payload) for every occurrence in one pass.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._built = False
+
+    def add(self, term, payload=None):
+        term = term.lower()
+        if not term:
+            return
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append((term, payload))
+        self._built = False
+
+    def build(self):
+        """Computes failure links breadth-first."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail_target = self._goto[fail].get(char, 0)
+                self._fail[child] = fail_target if fail_target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+
+    def find_all(self, text):
+        if not self._built:
+            self.build()
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                for term, payload in out[node]:
+                    yield index, term, payload
+
+
+class PostFilter:
+    """
+    Compiled blacklist check for search result posts.
+
+    Usage:
+        post_filter = PostFilter(company_blacklist, title_blacklist, poster_blacklist)
+        reason = post_filter.rejection_reason(author, headline, text)
+    """
+
+    def __init__(self, company_blacklist=(), title_blacklist=(), poster_blacklist=()):
+        self.matcher = AhoCorasick()
+        self.term_count = 0
+        for kind, terms in (('company', company_blacklist), ('title', title_blacklist),
+                            ('poster', poster_blacklist)):
+            for term in terms or ():
+                term = str(term).strip()
+                if term:
+                    self.matcher.add(term, kind)
+                    self.term_count += 1
+        self.matcher.build()
+
+    def rejection_reason(self, author='', headline='', text=''):
+        """Returns a description of the first blacklist hit, or None if the post is allowed."""
+        if not self.term_count:
+            return None
+
+        fields = (author or '', headline or '', text or '')
+        document = _FIELD_SEPARATOR.join(fields).lower()
+        boundaries = (len(fields[0]), len(fields[0]) + 1 + len(fields[1]))
+
+        for end, term, kind in self.matcher.find_all(document):
+            start = end - len(term) + 1
+            if not _on_word_boundary(document, start, end):
+                continue
+            field = AUTHOR if end < boundaries[0] else HEADLINE if end < boundaries[1] else TEXT
+            if field in BLACKLIST_FIELDS[kind]:
+                return f"{kind} blacklist: '{term}' in {field}"
+        return None
+
+    def allows(self, post):
+        """Checks a post dict with 'author', 'headline' and 'text' keys."""
+        return self.rejection_reason(post.get('author', ''), post.get('headline', ''),
+                                     post.get('text', '')) is None
+
+
+def _on_word_boundary(document, start, end):
+    before = document[start - 1] if start > 0 else ' '
+    after = document[end + 1] if end + 1 < len(document) else ' '
+    return not (before.isalnum() and document[start].isalnum()) and \
+        not (after.isalnum() and document[end].isalnum())
+
+
+def benchmark(term_count=5000, post_count=2000):
+    """Compares the automaton with a naive per-term scan and a regex alternation."""
+    rng = random.Random(11)
+
+    def word():
+        return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+    terms = [' '.join(word() for _ in range(rng.randint(1, 3))) for _ in range(term_count)]
+    vocabulary = [word() for _ in range(2000)] + terms[:50]
+    posts = [(word().title(), ' '.join(rng.choices(vocabulary, k=8)), ' '.join(rng.choices(vocabulary, k=150)))
+             for _ in range(post_count)]
+    size_mb = sum(len(a) + len(h) + len(t) for a, h, t in posts) / (1024 * 1024)
+
+    start = time.perf_counter()
+    post_filter = PostFilter(company_blacklist=terms)
+    build_time = time.perf_counter() - start
+    print(f"\n📊 {term_count} terms, {post_count} posts ({size_mb:.1f} MB); automaton built in {build_time:.2f}s")
+
+    regex = re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True)) + r')\b')
+
+    runs = (
+        ("aho-corasick", lambda a, h, t: post_filter.rejection_reason(a, h, t) is None),
+        ("regex alternation", lambda a, h, t: regex.search(f"{h}\n{t}".lower()) is None),
+        ("naive per-term scan", lambda a, h, t: not any(term in f"{h}\n{t}".lower() for term in terms)),
+    )
+    for name, allowed in runs:
+        sample = posts if name != "naive per-term scan" else posts[:200]
+        start = time.perf_counter()
+        kept = sum(1 for a, h, t in sample if allowed(a, h, t))
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<20} {len(sample) / elapsed:10.0f} posts/s  kept {kept}/{len(sample)}")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Blacklist matching benchmark")
+    parser.add_argument('--terms', type=int, default=5000, help="Number of blacklist terms")
+    parser.add_argument('--posts', type=int, default=2000, help="Number of synthetic posts")
+    args = parser.parse_args()
+    benchmark(args.terms, args.posts)
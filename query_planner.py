@@ -0,0 +1,161 @@
+"""
+QUERY_PLANNER.PY - Search Query Planning and Scheduling
+========================================================
+Expands config.yaml positions x locations into content-search queries and
+decides which of them are worth running this cycle.
+
+- Equivalent queries are merged: keywords are compared as a case-insensitive
+  bag of words (content search ignores word order), so "Java Developer Remote"
+  and "remote java developer" run once, and a location already named in the
+  position isn't appended twice.
+- Each query remembers its last run time, a fingerprint of the emails it
+  found and its yield (new contacts per run, smoothed), in query_state.json.
+- A query is due again after an interval that shrinks for high-yield queries
+  and grows for dead ones, between minIntervalMinutes and maxIntervalMinutes.
+  A query whose fingerprint didn't change since the last run counts as dead
+  for that run.
+
+Configure in config.yaml (all optional):
+
+    queryPlanner:
+      useLocations: true
+      minIntervalMinutes: 30
+      maxIntervalMinutes: 1440
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Exponential smoothing factor for per-query yield
+_YIELD_SMOOTHING = 0.5
+
+
+def normalize_keywords(keywords):
+    """Order- and case-insensitive key for a keyword string."""
+    return ' '.join(sorted(set(re.findall(r'\w+', str(keywords).lower()))))
+
+
+def fingerprint(emails):
+    """Order-independent fingerprint of a result set."""
+    digest = hashlib.sha1()
+    for email in sorted({e.lower() for e in emails}):
+        digest.update(email.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()[:16]
+
+
+class SearchQuery:
+    """One planned search: the position it serves and the keywords to search for."""
+
+    def __init__(self, position, location=None):
+        self.position = position
+        self.location = location
+        self.keywords = f"{position} {location}" if location else str(position)
+        self.key = normalize_keywords(self.keywords)
+
+    def __repr__(self):
+        return f"SearchQuery({self.keywords!r})"
+
+
+class QueryPlanner:
+    def __init__(self, positions, locations=(), settings=None, state_path='query_state.json'):
+        settings = settings or {}
+        self.use_locations = settings.get('useLocations', True)
+        self.min_interval = timedelta(minutes=settings.get('minIntervalMinutes', 30))
+        self.max_interval = timedelta(minutes=settings.get('maxIntervalMinutes', 1440))
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self.state = self._load_state()
+        self.queries = self.expand(positions, locations if self.use_locations else ())
+
+    @staticmethod
+    def expand(positions, locations=()):
+        """Returns the deduplicated position x location queries."""
+        queries = []
+        seen = set()
+        for position in positions:
+            position_words = set(normalize_keywords(position).split())
+            for location in (list(locations) or [None]):
+                # Blank locations, or ones the position already names, add nothing
+                if location is not None and set(normalize_keywords(location).split()) <= position_words:
+                    location = None
+                query = SearchQuery(position, location)
+                if query.key not in seen:
+                    seen.add(query.key)
+                    queries.append(query)
+        return queries
+
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not read {self.state_path}, starting fresh: {e}")
+        return {}
+
+    def save(self):
+        with self._lock:
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+
+    def interval_for(self, query):
+        """Time to wait between runs of a query, from its observed yield."""
+        entry = self.state.get(query.key)
+        if not entry:
+            return self.min_interval
+        # One new contact per run keeps the minimum interval; each halving doubles it
+        yield_score = max(entry.get('yield', 0.0), 0.0)
+        if yield_score >= 1:
+            return self.min_interval
+        factor = 1.0 / max(yield_score, 1.0 / 64)
+        return min(self.min_interval * factor, self.max_interval)
+
+    def next_due(self, query):
+        entry = self.state.get(query.key)
+        if not entry or not entry.get('last_run'):
+            return datetime.min
+        return datetime.strptime(entry['last_run'], DATETIME_FORMAT) + self.interval_for(query)
+
+    def due_queries(self, now=None):
+        """Queries due to run, highest yield first."""
+        now = now or datetime.now()
+        due = [query for query in self.queries if self.next_due(query) <= now]
+        return sorted(due, key=lambda q: -self.state.get(q.key, {}).get('yield', 1.0))
+
+    def record_result(self, query, emails, new_contacts, now=None):
+        """Updates a query's run time, fingerprint and smoothed yield."""
+        now = now or datetime.now()
+        result_fingerprint = fingerprint(emails)
+        with self._lock:
+            entry = self.state.setdefault(query.key, {'keywords': query.keywords, 'yield': 1.0, 'runs': 0})
+            unchanged = entry.get('fingerprint') == result_fingerprint
+            observed = 0.0 if unchanged else float(new_contacts)
+            entry['yield'] = _YIELD_SMOOTHING * observed + (1 - _YIELD_SMOOTHING) * entry.get('yield', 1.0)
+            entry['fingerprint'] = result_fingerprint
+            entry['last_run'] = now.strftime(DATETIME_FORMAT)
+            entry['last_new_contacts'] = new_contacts
+            entry['runs'] = entry.get('runs', 0) + 1
+        return entry
+
+
+_planner = None
+_planner_lock = threading.Lock()
+
+
+def get_query_planner(parameters):
+    """Returns the process-wide QueryPlanner, so parallel workers share one state file."""
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            _planner = QueryPlanner(parameters.get('positions', []), parameters.get('locations', []),
+                                    parameters.get('queryPlanner'))
+        return _planner
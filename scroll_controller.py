@@ -0,0 +1,135 @@
+"""
+SCROLL_CONTROLLER.PY - Adaptive Feed Scrolling
+===============================================
+Decides when search_posts should stop scrolling a results page.
+
+Instead of a fixed 15 scrolls per position, the controller watches what each
+scroll produced (new posts, new emails, page height) and:
+- stops after `patience` scrolls in a row that added no posts and didn't grow
+  the page (the feed ran out),
+- stops after `email_patience` scrolls in a row that added no new emails,
+- stops at `max_scrolls`, unless the recent yield is at least
+  `high_yield` emails per scroll, in which case it keeps going up to
+  `budget` scrolls.
+
+It also keeps the DOM node count and JS heap size after each scroll, to show
+whether prunePosts keeps browser memory flat on deep scrolls.
+
+Settings come from the optional `scroll` section of config.yaml:
+
+    scroll:
+      minScrolls: 3
+      maxScrolls: 15
+      patience: 3
+      emailPatience: 6
+      highYield: 1.0
+      budget: 40
+      prunePosts: false   # read by LinkedinEasyApply, not the controller
+"""
+
+
+class ScrollController:
+    def __init__(self, min_scrolls=3, max_scrolls=15, patience=3, email_patience=6,
+                 high_yield=1.0, budget=40, yield_window=3):
+        self.min_scrolls = min_scrolls
+        self.max_scrolls = max_scrolls
+        self.patience = patience
+        self.email_patience = email_patience
+        self.high_yield = high_yield
+        self.budget = max(budget, max_scrolls)
+        self.yield_window = yield_window
+
+        self.scrolls = 0
+        self.posts = 0
+        self.emails = 0
+        self.stop_reason = None
+        self._stale_scrolls = 0
+        self._dry_scrolls = 0
+        self._last_height = None
+        self._recent_emails = []
+        self.dom_nodes = []
+        self.heap_bytes = []
+
+    @classmethod
+    def from_config(cls, scroll_config):
+        """Builds a controller from the config.yaml `scroll` section (may be empty)."""
+        scroll_config = scroll_config or {}
+        return cls(
+            min_scrolls=scroll_config.get('minScrolls', 3),
+            max_scrolls=scroll_config.get('maxScrolls', 15),
+            patience=scroll_config.get('patience', 3),
+            email_patience=scroll_config.get('emailPatience', 6),
+            high_yield=scroll_config.get('highYield', 1.0),
+            budget=scroll_config.get('budget', 40),
+        )
+
+    def record_initial(self, posts, emails, page_height, dom_nodes=0, heap_bytes=0):
+        """Records what was on the page before the first scroll."""
+        self.posts += posts
+        self.emails += emails
+        self._last_height = page_height
+        self._record_memory(dom_nodes, heap_bytes)
+
+    def record(self, new_posts, new_emails, page_height, dom_nodes=0, heap_bytes=0):
+        """Records the outcome of one scroll."""
+        self.scrolls += 1
+        self._record_memory(dom_nodes, heap_bytes)
+        self.posts += new_posts
+        self.emails += new_emails
+
+        grew = self._last_height is None or page_height > self._last_height
+        self._last_height = page_height
+        self._stale_scrolls = 0 if (new_posts or grew) else self._stale_scrolls + 1
+        self._dry_scrolls = 0 if new_emails else self._dry_scrolls + 1
+
+        self._recent_emails.append(new_emails)
+        del self._recent_emails[:-self.yield_window]
+
+    def _record_memory(self, dom_nodes, heap_bytes):
+        self.dom_nodes.append(dom_nodes)
+        self.heap_bytes.append(heap_bytes)
+
+    @property
+    def recent_yield(self):
+        """Emails per scroll over the last few scrolls."""
+        if not self._recent_emails:
+            return 0.0
+        return sum(self._recent_emails) / len(self._recent_emails)
+
+    @property
+    def emails_per_scroll(self):
+        return self.emails / self.scrolls if self.scrolls else 0.0
+
+    def should_continue(self):
+        """Returns True if another scroll is worthwhile, setting stop_reason otherwise."""
+        if self.scrolls < self.min_scrolls:
+            return True
+        if self.scrolls >= self.budget:
+            self.stop_reason = "scroll budget used"
+        elif self._stale_scrolls >= self.patience:
+            self.stop_reason = "no new posts"
+        elif self._dry_scrolls >= self.email_patience:
+            self.stop_reason = "no new emails"
+        elif self.scrolls >= self.max_scrolls and self.recent_yield < self.high_yield:
+            self.stop_reason = "max scrolls reached"
+        else:
+            return True
+        return False
+
+    def summary(self):
+        return {
+            'scrolls': self.scrolls,
+            'posts': self.posts,
+            'emails': self.emails,
+            'emails_per_scroll': round(self.emails_per_scroll, 2),
+            'stop_reason': self.stop_reason,
+            'dom_nodes': _series(self.dom_nodes),
+            'heap_mb': _series([round(size / 1048576, 1) for size in self.heap_bytes]),
+        }
+
+
+def _series(values):
+    """Start, end and peak of a per-scroll measurement."""
+    if not values:
+        return {}
+    return {'start': values[0], 'end': values[-1], 'max': max(values)}
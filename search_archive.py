@@ -0,0 +1,250 @@
+"""
+SEARCH_ARCHIVE.PY - Capture and Replay of Search Result Pages
+==============================================================
+Iterating on extraction or filtering against live LinkedIn costs a logged-in
+session and 30+ seconds of scrolling per position. Capture mode saves what
+the browser handed the bot instead: every batch of posts returned by the
+in-page extraction script (author, headline, text, URN), the page_source
+fallback when it was used, the query URL, timestamps, the blacklists in
+effect and the live outputs. Each search is one gzip-compressed JSON archive.
+
+Replay mode feeds archives through the same process_posts() stage the live
+scraper uses (blacklist filter, then email extraction) and the contact dedupe
+index, without a browser and at full CPU speed. Since the stages are shared,
+replaying an archive with its recorded blacklists reproduces the recorded
+emails and filter decisions exactly; --check turns that into a regression test.
+Dedupe runs against a throwaway in-memory ledger, so replays never touch
+contacts.db.
+
+Capture is enabled in config.yaml:
+
+    capture:
+      enabled: true
+      directory: captures
+
+Replay:
+
+    python search_archive.py captures/*.json.gz --check --repeat 20
+"""
+
+import glob
+import gzip
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+import metrics
+from contact_ledger import ContactLedger, ContactIndex
+from email_extractor import extract_emails, extract_emails_batch
+from post_filter import PostFilter
+
+ARCHIVE_VERSION = 1
+ARCHIVE_SUFFIX = '.json.gz'
+
+
+def process_posts(posts, post_filter, found_emails):
+    """
+    The post stage shared by live search and replay: drops posts that hit a
+    blacklist, then adds the addresses in the remaining posts to found_emails.
+
+    Returns:
+        list: [(post, reason)] for the rejected posts
+    """
+    rejected = []
+    allowed_texts = []
+    for post in posts:
+        reason = post_filter.rejection_reason(post.get('author', ''), post.get('headline', ''), post.get('text', ''))
+        if reason:
+            rejected.append((post, reason))
+        else:
+            allowed_texts.append(post.get('text', ''))
+    with metrics.span('extract_emails'):
+        found_emails.update(extract_emails_batch(allowed_texts))
+    return rejected
+
+
+def extract_page_source(page_source, found_emails):
+    """The page_source fallback used when no post nodes were found."""
+    found_emails.update(extract_emails(page_source))
+
+
+class SearchRecording:
+    """Everything captured for one search; written out by finish()."""
+
+    def __init__(self, directory, position, keywords, url, blacklists):
+        self.directory = directory
+        self.data = {
+            'version': ARCHIVE_VERSION,
+            'position': position,
+            'keywords': keywords,
+            'url': url,
+            'blacklists': blacklists,
+            'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f'),
+            'batches': [],
+            'page_source': None,
+        }
+
+    def add_batch(self, posts, known):
+        self.data['batches'].append({
+            'at': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f'),
+            'known': known,
+            'posts': posts,
+        })
+
+    def add_page_source(self, page_source):
+        self.data['page_source'] = page_source
+
+    def finish(self, emails, rejected, new_contacts):
+        """Stores the live outputs and writes the archive. Returns its path."""
+        self.data['finished_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        self.data['outputs'] = {
+            'emails': sorted(emails),
+            'rejected': [[post.get('urn', ''), reason] for post, reason in rejected],
+            'new_contacts': sorted(new_contacts),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r'[^a-z0-9]+', '-', self.data['keywords'].lower()).strip('-') or 'search'
+        path = os.path.join(self.directory, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{slug}{ARCHIVE_SUFFIX}")
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=9) as f:
+            json.dump(self.data, f, separators=(',', ':'))
+        print(f"💾 Captured search for '{self.data['keywords']}' to {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+        return path
+
+
+class SearchCapture:
+    """Starts a SearchRecording per search when capture is enabled in config.yaml."""
+
+    def __init__(self, directory, blacklists):
+        self.directory = directory
+        self.blacklists = blacklists
+
+    @classmethod
+    def from_config(cls, parameters):
+        """Returns a SearchCapture, or None if capture is off."""
+        settings = parameters.get('capture', {}) or {}
+        if not settings.get('enabled', False):
+            return None
+        blacklists = {
+            'company': list(parameters.get('companyBlacklist', []) or []),
+            'title': list(parameters.get('titleBlacklist', []) or []),
+            'poster': list(parameters.get('posterBlacklist', []) or []),
+        }
+        return cls(settings.get('directory', 'captures'), blacklists)
+
+    def start(self, position, keywords, url):
+        return SearchRecording(self.directory, position, keywords, url, self.blacklists)
+
+
+def load_archive(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def replay_archive(archive, post_filter=None, contact_index=None, cooldown_days=0):
+    """
+    Runs an archive's captured posts through filtering, extraction and dedupe.
+    Uses the blacklists recorded in the archive unless post_filter is given.
+
+    Returns:
+        dict: emails, rejected [[urn, reason]], new_contacts and skipped
+    """
+    if post_filter is None:
+        blacklists = archive.get('blacklists', {})
+        post_filter = PostFilter(blacklists.get('company'), blacklists.get('title'), blacklists.get('poster'))
+    if contact_index is None:
+        contact_index = ContactIndex(ContactLedger(':memory:', csv_path=''), cooldown_days)
+
+    found_emails = set()
+    rejected = []
+    posts_seen = 0
+    for batch in archive['batches']:
+        posts_seen += len(batch['posts']) + batch.get('known', 0)
+        rejected.extend(process_posts(batch['posts'], post_filter, found_emails))
+    if posts_seen == 0 and archive.get('page_source'):
+        extract_page_source(archive['page_source'], found_emails)
+
+    new_contacts, skipped = contact_index.record(sorted(found_emails), archive['position']) \
+        if found_emails else ([], [])
+    return {
+        'emails': sorted(found_emails),
+        'rejected': [[post.get('urn', ''), reason] for post, reason in rejected],
+        'new_contacts': sorted(new_contacts),
+        'skipped': len(skipped),
+    }
+
+
+def compare_outputs(recorded, replayed):
+    """Returns a list of differences between recorded and replayed outputs (emails and filter decisions)."""
+    differences = []
+    for key in ('emails', 'rejected'):
+        expected = recorded.get(key, [])
+        actual = replayed.get(key, [])
+        if expected != actual:
+            missing = [item for item in expected if item not in actual]
+            extra = [item for item in actual if item not in expected]
+            differences.append(f"{key}: {len(missing)} missing {missing[:3]}, {len(extra)} extra {extra[:3]}")
+    return differences
+
+
+def _load_blacklists_from_config(path):
+    import yaml
+    with open(path, 'r', encoding='utf-8') as stream:
+        parameters = yaml.safe_load(stream)
+    return PostFilter(parameters.get('companyBlacklist', []) or [], parameters.get('titleBlacklist', []) or [],
+                      parameters.get('posterBlacklist', []) or [])
+
+
+def replay(paths, check=False, repeat=1, config_path=None):
+    """
+    Replays archives, optionally checking them against their recorded outputs
+    and repeating them for stable timings. Returns the number of mismatches.
+    """
+    archives = [(path, load_archive(path)) for path in paths]
+    if not archives:
+        print("No archives to replay")
+        return 0
+    post_filter = _load_blacklists_from_config(config_path) if config_path else None
+
+    mismatches = 0
+    for path, archive in archives:
+        replayed = replay_archive(archive, post_filter)
+        posts = sum(len(batch['posts']) for batch in archive['batches'])
+        line = (f"  {os.path.basename(path)}: {posts} post(s), {len(replayed['emails'])} email(s), "
+                f"{len(replayed['rejected'])} filtered, {len(replayed['new_contacts'])} new contact(s)")
+        if check:
+            differences = compare_outputs(archive.get('outputs', {}), replayed)
+            if differences:
+                mismatches += 1
+                line += " ❌ " + "; ".join(differences)
+            else:
+                line += " ✅ identical"
+        print(line)
+
+    total_posts = sum(len(batch['posts']) for _, archive in archives for batch in archive['batches'])
+    total_mb = sum(len(post.get('text', '')) for _, archive in archives for batch in archive['batches']
+                   for post in batch['posts']) / 1048576
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, archive in archives:
+            replay_archive(archive, post_filter)
+    elapsed = time.perf_counter() - start
+    print(f"\n⚡ Replayed {len(archives)} archive(s) x{repeat}: "
+          f"{total_posts * repeat / elapsed:.0f} posts/s, {total_mb * repeat / elapsed:.1f} MB/s of post text")
+    if check:
+        print(f"{'✅ All archives reproduce their recorded outputs' if not mismatches else f'❌ {mismatches} archive(s) differ'}")
+    return mismatches
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(description="Replay captured search archives without a browser")
+    parser.add_argument('archives', nargs='*', help=f"Archive files (default: captures/*{ARCHIVE_SUFFIX})")
+    parser.add_argument('--check', action='store_true', help="Fail if outputs differ from the recorded ones")
+    parser.add_argument('--repeat', type=int, default=1, help="Replay the set N times for timing")
+    parser.add_argument('--config', help="Use blacklists from this config.yaml instead of the recorded ones")
+    args = parser.parse_args()
+    paths = args.archives or sorted(glob.glob(os.path.join('captures', '*' + ARCHIVE_SUFFIX)))
+    sys.exit(1 if replay(paths, args.check, args.repeat, args.config) else 0)